@@ -0,0 +1,155 @@
+"""
+BTC GOLD - Buffers do Batch (hot loop sem alocacao por chave)
+
+Um BatchBuffers por worker, reutilizado em todos os batches:
+
+    scalars   32 bytes por chave (big-endian)
+    pub_c/u   pubkeys serializadas (33/65 bytes)
+    sha_c/u   digests SHA256 (32 bytes)
+    h160_c/u  digests HASH160 (20 bytes)
+
+Com o coincurve (cffi) a pubkey e criada e serializada pela libsecp256k1
+direto dentro dos buffers: nenhum PrivateKey/PublicKey, lista ou bytes de
+pubkey por chave. O RIPEMD160 em lote escreve em h160_c/u e a verificacao
+le desses buffers. Os buffers so sao realocados quando o batch adaptativo
+cresce alem da capacidade atual.
+
+Sem acesso ao cffi do coincurve, cai para o caminho PrivateKey (mesmo
+resultado, mais lento).
+"""
+
+import hashlib
+
+from ripemd160 import ripemd160_batch_into
+
+
+def _load_secp256k1():
+    """(ffi, lib, ctx) do coincurve ou None se o binding cffi nao estiver acessivel."""
+    try:
+        from coincurve._libsecp256k1 import ffi, lib
+        from coincurve.context import GLOBAL_CONTEXT
+        return ffi, lib, GLOBAL_CONTEXT.ctx
+    except (ImportError, AttributeError):
+        return None
+
+
+class BatchBuffers:
+    def __init__(self, capacity, compressed=True, uncompressed=False):
+        self.compressed = compressed
+        self.uncompressed = uncompressed
+        self.n = 0
+        self.capacity = 0
+
+        secp = _load_secp256k1()
+        if secp is not None:
+            self._ffi, self._lib, self._ctx = secp
+            self._pubkey = self._ffi.new('secp256k1_pubkey *')
+            self._outlen = self._ffi.new('size_t *')
+            self.backend = "libsecp256k1 (cffi, in-place)"
+        else:
+            from coincurve import PrivateKey
+            self._ffi = None
+            self._private_key = PrivateKey
+            self.backend = "coincurve PrivateKey"
+
+        self.ensure(capacity)
+        self.add = self._add_cffi if self._ffi is not None else self._add_fallback
+
+    # --- CAPACIDADE ---
+    def ensure(self, capacity):
+        """Garante espaco para `capacity` chaves (realoca so se crescer)."""
+        if capacity <= self.capacity:
+            return
+        self.capacity = capacity
+        self.scalars = bytearray(32 * capacity)
+        self.pub_c = bytearray(33 * capacity) if self.compressed else None
+        self.pub_u = bytearray(65 * capacity) if self.uncompressed else None
+        self.sha_c = bytearray(32 * capacity) if self.compressed else None
+        self.sha_u = bytearray(32 * capacity) if self.uncompressed else None
+        self.h160_c = bytearray(20 * capacity) if self.compressed else None
+        self.h160_u = bytearray(20 * capacity) if self.uncompressed else None
+
+        if self._ffi is not None:
+            from_buffer = self._ffi.from_buffer
+            self._scalars_p = from_buffer(self.scalars)
+            self._pub_c_p = from_buffer(self.pub_c) if self.compressed else None
+            self._pub_u_p = from_buffer(self.pub_u) if self.uncompressed else None
+
+    def reset(self, capacity):
+        """Inicio de batch: ate `capacity` chaves, slots anteriores descartados."""
+        self.ensure(capacity)
+        self.n = 0
+
+    # --- DERIVAÇÃO (1 CHAVE -> PUBKEYS NO PRÓXIMO SLOT) ---
+    def _add_cffi(self, key):
+        """Deriva `key` no proximo slot. False se a chave for invalida (0 ou >= n)."""
+        j = self.n
+        o = j * 32
+        try:
+            self.scalars[o:o + 32] = key.to_bytes(32, 'big')
+        except OverflowError:
+            return False
+
+        lib, ctx, pubkey, outlen = self._lib, self._ctx, self._pubkey, self._outlen
+        if not lib.secp256k1_ec_pubkey_create(ctx, pubkey, self._scalars_p + o):
+            return False
+
+        if self.compressed:
+            outlen[0] = 33
+            lib.secp256k1_ec_pubkey_serialize(ctx, self._pub_c_p + j * 33, outlen, pubkey,
+                                              lib.SECP256K1_EC_COMPRESSED)
+        if self.uncompressed:
+            outlen[0] = 65
+            lib.secp256k1_ec_pubkey_serialize(ctx, self._pub_u_p + j * 65, outlen, pubkey,
+                                              lib.SECP256K1_EC_UNCOMPRESSED)
+        self.n = j + 1
+        return True
+
+    def _add_fallback(self, key):
+        j = self.n
+        try:
+            priv_bytes = key.to_bytes(32, 'big')
+            pk = self._private_key(priv_bytes)
+        except:
+            return False
+
+        self.scalars[j * 32:j * 32 + 32] = priv_bytes
+        if self.compressed:
+            self.pub_c[j * 33:j * 33 + 33] = pk.public_key.format(compressed=True)
+        if self.uncompressed:
+            self.pub_u[j * 65:j * 65 + 65] = pk.public_key.format(compressed=False)
+        self.n = j + 1
+        return True
+
+    # --- HASH160 EM LOTE ---
+    def hash160(self):
+        """SHA256 de cada pubkey em sha_*, depois RIPEMD160 em lote em h160_*."""
+        sha256 = hashlib.sha256
+        n = self.n
+        for pub, size, sha in ((self.pub_c, 33, self.sha_c), (self.pub_u, 65, self.sha_u)):
+            if pub is None:
+                continue
+            pub_mv = memoryview(pub)
+            for j in range(n):
+                o = j * size
+                sha[j * 32:j * 32 + 32] = sha256(pub_mv[o:o + size]).digest()
+        if self.compressed:
+            ripemd160_batch_into(self.sha_c, n, self.h160_c)
+        if self.uncompressed:
+            ripemd160_batch_into(self.sha_u, n, self.h160_u)
+
+    # --- LEITURA ---
+    def matches(self, targets):
+        """(priv_int, h160, tipo) de cada slot cujo HASH160 esta em `targets`."""
+        n = self.n
+        for h160, type_found in ((self.h160_c, "Compressed"), (self.h160_u, "Uncompressed")):
+            if h160 is None:
+                continue
+            raw = bytes(memoryview(h160)[:20 * n])  # 1 copia por batch: set exige bytes
+            for o in range(0, 20 * n, 20):
+                h = raw[o:o + 20]
+                if h in targets:
+                    yield self.key(o // 20), h, type_found
+
+    def key(self, j):
+        return int.from_bytes(self.scalars[j * 32:j * 32 + 32], 'big')
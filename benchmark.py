@@ -12,6 +12,8 @@ import os
 import sys
 from datetime import datetime
 
+from ripemd160 import RIPEMD160_BACKEND, ripemd160
+
 try:
     from coincurve import PrivateKey
 except ImportError:
@@ -41,6 +43,7 @@ print(f"{Fore.CYAN}[*] Iniciando benchmark...\n")
 # Detectar CPU
 logical_cores = os.cpu_count()
 print(f"{Fore.WHITE}[*] CPU Cores: {logical_cores}")
+print(f"{Fore.WHITE}[*] RIPEMD160: {RIPEMD160_BACKEND}")
 
 # Teste 1: Apenas geração de chaves (baseline)
 print(f"\n{Fore.YELLOW}[TEST 1] Key Generation Only")
@@ -64,9 +67,7 @@ for i in range(100000):
     pk = PrivateKey(priv_bytes)
     pub_c = pk.public_key.format(compressed=True)
     sha = hashlib.sha256(pub_c).digest()
-    rip = hashlib.new('ripemd160')
-    rip.update(sha)
-    h160 = rip.digest()
+    h160 = ripemd160(sha)
 elapsed = time.time() - start
 hash_compressed_kps = (100000 / elapsed) / 1000
 
@@ -82,9 +83,7 @@ for i in range(100000):
     pk = PrivateKey(priv_bytes)
     pub_u = pk.public_key.format(compressed=False)
     sha = hashlib.sha256(pub_u).digest()
-    rip = hashlib.new('ripemd160')
-    rip.update(sha)
-    h160 = rip.digest()
+    h160 = ripemd160(sha)
 elapsed = time.time() - start
 hash_uncompressed_kps = (100000 / elapsed) / 1000
 
@@ -102,16 +101,12 @@ for i in range(50000):
     # Compressed
     pub_c = pk.public_key.format(compressed=True)
     sha = hashlib.sha256(pub_c).digest()
-    rip = hashlib.new('ripemd160')
-    rip.update(sha)
-    h160_c = rip.digest()
+    h160_c = ripemd160(sha)
     
     # Uncompressed
     pub_u = pk.public_key.format(compressed=False)
     sha = hashlib.sha256(pub_u).digest()
-    rip = hashlib.new('ripemd160')
-    rip.update(sha)
-    h160_u = rip.digest()
+    h160_u = ripemd160(sha)
 elapsed = time.time() - start
 hash_both_kps = (100000 / elapsed) / 1000  # 50k * 2 = 100k total
 
@@ -1,83 +1,76 @@
 import os
 import sys
 import time
+
+STARTUP_T0 = time.time()  # Referência para o tempo de startup até a 1ª chave
+
 import json
 import secrets
 import platform
 import hashlib
 import binascii
+import importlib.util
 from multiprocessing import Process, Value, cpu_count, Event, Manager, Array
 from datetime import datetime
 import gc
 import struct
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+# --- DEPENDÊNCIAS PESADAS: IMPORT SOB DEMANDA ---
+# Numba (import de segundos), coincurve, base58, colorama e psutil só são
+# importados quando o job/backend escolhido precisa deles.
+def _has_module(name):
+    return importlib.util.find_spec(name) is not None
 
 # --- TENTATIVA DE ACELERAÇÃO: NUMBA JIT ---
-NUMBA_AVAILABLE = False
-try:
-    from numba import njit, prange
-    NUMBA_AVAILABLE = True
-except ImportError:
-    pass
+NUMBA_AVAILABLE = _has_module("numba")
+
+# --- RIPEMD-160 (OpenSSL ou fallback embutido) ---
+from ripemd160 import RIPEMD160_BACKEND, RIPEMD160_NATIVE, ripemd160
 
 # --- VERIFICAÇÃO DE DEPENDÊNCIAS CRÍTICAS ---
-try:
-    from coincurve import PrivateKey, PublicKey
-    BACKEND = "COINCURVE"
-except ImportError:
-    print("\n[CRITICAL ERROR] 'coincurve' não encontrado.")
-    print("Execute: pip install -r requirements.txt")
-    sys.exit()
-
-try:
-    import base58
-except ImportError:
-    print("\n[CRITICAL ERROR] 'base58' não encontrado.")
-    print("Execute: pip install -r requirements.txt")
-    sys.exit()
-
-try:
-    from colorama import Fore, Style, init
-    init(autoreset=True)
-except ImportError:
-    class Fore: RED=GREEN=YELLOW=CYAN=MAGENTA=WHITE=RESET=""
-    class Style: BRIGHT=DIM=NORMAL=""
-
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
+BACKEND = "COINCURVE"
+
+def require_crypto_backend():
+    """Importa coincurve/base58 (antes de iniciar os workers) ou encerra."""
+    for name in ("coincurve", "base58"):
+        if not _has_module(name):
+            print(f"\n[CRITICAL ERROR] '{name}' não encontrado.")
+            print("Execute: pip install -r requirements.txt")
+            sys.exit(1)
+    import coincurve, base58
+
+class Fore: RED=GREEN=YELLOW=CYAN=MAGENTA=WHITE=BLUE=RESET=""
+class Style: BRIGHT=DIM=NORMAL=RESET_ALL=""
+
+def init_colors():
+    """Ativa colorama (modo interativo). Sem colorama, mantém texto puro."""
+    global Fore, Style
+    try:
+        from colorama import Fore, Style, init
+        init(autoreset=True)
+    except ImportError:
+        pass
+
+HAS_PSUTIL = _has_module("psutil")
 
 # --- CONSTANTES ---
 FILE_DIR = os.path.dirname(os.path.abspath(__file__))
 TARGET_FILE = os.path.join(FILE_DIR, "alvos.txt")
 FOUND_FILE = os.path.join(FILE_DIR, "found_gold.txt")
 CHECKPOINT_FILE = os.path.join(FILE_DIR, "checkpoint.json")
+PUZZLE_FILE = os.path.join(FILE_DIR, "alvos_address_puzzle.txt")
 MAX_KEY_LIMIT = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
-# --- POOL DE MEMÓRIA (Otimização: evita realocação) ---
-class MemoryPool:
-    def __init__(self, size=1000):
-        self.pool = [bytearray(32) for _ in range(size)]
-        self.index = 0
-        self.size = size
-    
-    def get(self):
-        ba = self.pool[self.index]
-        self.index = (self.index + 1) % self.size
-        return ba
-
-# --- CACHE PRÉ-ALOCADO PARA HASH160 ---
-class Hash160Cache:
-    def __init__(self, capacity=100000):
-        self.cache = {}  # h160_bytes -> bool (True = encontrado)
-        self.capacity = capacity
-    
-    def add_target(self, h160_bytes):
-        self.cache[h160_bytes] = False
-    
-    def check(self, h160_bytes):
-        return h160_bytes in self.cache
+# --- BATCH ADAPTATIVO ---
+# Tamanho do batch ajustado em runtime para durar ~BATCH_TARGET_S: stop/found
+# são checados entre batches, então a latência de parada fica limitada a isso.
+BATCH_TARGET_S = 0.05
+BATCH_MIN = 64
+BATCH_MAX = 200000
+DISPLAY_INTERVAL_S = 0.5
 
 # --- DETECÇÃO DE HARDWARE ---
 def detect_system_specs():
@@ -87,6 +80,7 @@ def detect_system_specs():
     
     ram_info = "N/A"
     if HAS_PSUTIL:
+        import psutil
         mem = psutil.virtual_memory()
         ram_total = round(mem.total / (1024**3), 2)
         ram_info = f"{ram_total} GB"
@@ -96,6 +90,12 @@ def detect_system_specs():
     print(f"{Fore.WHITE}[*] CORES   : {logical_cores} (Logical)")
     print(f"{Fore.WHITE}[*] RAM     : {ram_info}")
     print(f"{Fore.WHITE}[*] Numba JIT: {('ATIVO' if NUMBA_AVAILABLE else 'INATIVO (instale: pip install numba)')}")
+    print(f"{Fore.WHITE}[*] RIPEMD160: {RIPEMD160_BACKEND}")
+    print(f"{Fore.WHITE}[*] GIL     : {('DESLIGADO (free-threaded)' if gil_disabled() else 'ATIVO')}")
+    if not RIPEMD160_NATIVE:
+        print(f"{Fore.YELLOW}[!] OpenSSL sem RIPEMD160 (provider legacy desativado): usando implementação embutida")
+        if RIPEMD160_BACKEND == "BUILTIN (Python)":
+            print(f"{Fore.RED}[!] RIPEMD160 embutido sem numpy: ~5x mais lento (instale: pip install -r requirements.txt)")
     print(f"{Fore.CYAN}................................................")
     return logical_cores
 
@@ -107,6 +107,7 @@ def load_targets(file_path, input_type):
         return targets, 0
 
     print(f"{Fore.YELLOW}[*] Processando Database ({input_type})...")
+    import base58
     
     try:
         with open(file_path, 'r') as f:
@@ -135,9 +136,7 @@ def load_targets(file_path, input_type):
                             pub_bytes = bytes.fromhex(line)
                             # Converte PubKey -> SHA256 -> RIPEMD160
                             sha = hashlib.sha256(pub_bytes).digest()
-                            rip = hashlib.new('ripemd160')
-                            rip.update(sha)
-                            h160_bytes = rip.digest()
+                            h160_bytes = ripemd160(sha)
 
                     if h160_bytes and len(h160_bytes) == 20:
                         targets.add(h160_bytes)
@@ -153,29 +152,64 @@ def load_targets(file_path, input_type):
         return set(), 0
 
 # --- ENGINE OTIMIZADA (V2.4 - PRO) ---
-def worker_engine(core_id, num_cores, start_val, stride, mode, multiplier, target_set, counter, found_event, stop_event, stop_on_find, found_list, lock, shared_key_display, scan_mode, range_start=None, range_end=None):
+def worker_engine(core_id, num_cores, start_val, stride, mode, multiplier, target_set, counter, found_event, stop_event, stop_on_find, found_list, lock, shared_key_display, scan_mode, range_start=None, range_end=None, canary_set=None, canary_hits=None, seed=None, max_keys=None, coverage=None, heartbeats=None, progress=None, resume_from=None, batch_target=BATCH_TARGET_S, targets_table=None, manage_gc=True):
     """
     V2.4 Pro Optimizations:
-    - Batch processing (10000 keys por batch)
-    - Memory pooling (evita malloc em hot loop)
+    - Batch adaptativo (~BATCH_TARGET_S por batch, medido em runtime)
+    - Buffers do batch reutilizados (batch_buffers.py): pubkey, SHA256 e
+      HASH160 escritos in-place, sem PrivateKey/listas por chave
     - Pre-computed target set (lookup O(1))
-    - Inline hashing (menos function calls)
+    - RIPEMD160 em lote (OpenSSL ou fallback embutido vetorizado)
     - GC disabled durante execução
     - Prefetch hints para CPU cache
+
+    Execução determinística (benchmarks A/B):
+    - seed: RANDOM usa um PRNG derivado de (seed, core_id, num_cores)
+    - max_keys: orçamento total de chaves, dividido entre os cores
+    - coverage: lista compartilhada que recebe (core_id, count, soma dos
+      SHA256 das chaves válidas mod 2^256), para o digest de cobertura
+
+    Supervisor:
+    - heartbeats[core_id]: timestamp gravado a cada batch
+    - progress[core_id].value: posição atual (hex) em LINEAR/GEOMETRIC,
+      escrita sob progress[core_id].get_lock()
+    - resume_from: retoma a sequência deste core a partir dessa posição
+
+    manage_gc=False: o GC é do processo inteiro; no backend THREAD quem o
+    desliga/religa é start_workers (ver _gc_hold/_gc_release).
+
+    Hot reload:
+    - targets_table: TargetTableReader; entre batches, troca o set de alvos
+      se uma versão nova da database foi publicada (target_table.py)
+
+    O counter recebe só as chaves válidas efetivamente verificadas; chaves
+    fora de [1, n) são puladas sem contar.
     """
-    import hashlib
-    
-    # --- PRÉ-ALOCAÇÃO ---
-    sha256 = hashlib.sha256
-    new_ripemd = lambda: hashlib.new('ripemd160')
-    memory_pool = MemoryPool(100)
-    
+    from batch_buffers import BatchBuffers
+
     check_compressed = (scan_mode in [1, 3])
     check_uncompressed = (scan_mode in [2, 3])
     
-    BATCH_SIZE = 10000
-    UPDATE_INTERVAL = 50000  # Update counter a cada 50k keys
-    
+    # Batch inicial pequeno: o 1º batch já mede a velocidade real do host
+    batch_size = BATCH_MIN * 4
+    perf_counter = time.perf_counter
+    next_display = 0.0
+
+    # Gerador de chaves: secrets (padrão) ou PRNG determinístico (--seed)
+    if seed is not None:
+        rng = random.Random(derive_core_seed(seed, core_id, num_cores))
+        randbelow = rng.randrange
+        randbits = rng.getrandbits
+    else:
+        randbelow = secrets.randbelow
+        randbits = lambda bits: int.from_bytes(secrets.token_bytes(bits // 8), 'big')
+
+    # Orçamento de chaves deste core (None = infinito)
+    remaining = None
+    if max_keys is not None:
+        remaining = max_keys // num_cores + (1 if core_id < max_keys % num_cores else 0)
+    cov_count, cov_sum = 0, 0
+
     # Inicialização: Cada core começa em seu ponto único
     if mode == "LINEAR":
         current = start_val + core_id
@@ -183,92 +217,149 @@ def worker_engine(core_id, num_cores, start_val, stride, mode, multiplier, targe
         current = start_val + core_id
     elif mode == "RANDOM":
         current = None
+    if resume_from is not None and mode in ["LINEAR", "GEOMETRIC"]:
+        current = resume_from
+    track_progress = progress is not None and mode in ["LINEAR", "GEOMETRIC"]
     
     local_targets = target_set
-    batch_count = 0
-    
-    gc.disable()  # CRÍTICO: desabilitar GC durante hot loop
+    if targets_table is not None:
+        targets_table = targets_table.local()
+    buffers = BatchBuffers(batch_size, check_compressed, check_uncompressed)
+    add_key = buffers.add
+
+    if manage_gc:
+        gc.disable()  # CRÍTICO: desabilitar GC durante hot loop
+    if heartbeats is not None:
+        heartbeats[core_id] = time.time()  # Pronto: a próxima instrução gera a 1ª chave
 
     while not stop_event.is_set():
         if stop_on_find and found_event.is_set(): 
             break
 
-        for _ in range(BATCH_SIZE):
+        if targets_table is not None:
+            new_targets = targets_table.poll(core_id)
+            if new_targets is not None:
+                local_targets = new_targets
+
+        if mode != "RANDOM" and current >= MAX_KEY_LIMIT:
+            break  # Sequência LINEAR/GEOMETRIC saiu da curva: nada mais a verificar
+
+        batch_n = batch_size
+        if remaining is not None:
+            if remaining <= 0:
+                break
+            batch_n = min(batch_size, remaining)
+            remaining -= batch_n
+        t_batch = perf_counter()
+        buffers.reset(batch_n)
+
+        for _ in range(batch_n):
             
             # --- GERAÇÃO DA CHAVE ---
             if mode == "RANDOM":
                 if range_end:
-                    current = secrets.randbelow(range_end - range_start) + range_start
+                    current = randbelow(range_end - range_start) + range_start
                 else:
-                    current = int.from_bytes(secrets.token_bytes(32), 'big') % MAX_KEY_LIMIT
+                    current = randbits(256) % MAX_KEY_LIMIT
             
-            try:
-                priv_bytes = current.to_bytes(32, 'big')
-                pk = PrivateKey(priv_bytes)
-            except:
-                if mode in ["LINEAR", "GEOMETRIC"]:
-                    if mode == "LINEAR": 
-                        current += stride
-                    elif mode == "GEOMETRIC": 
-                        current *= multiplier
-                continue
-
-            # --- HASHING E VERIFICAÇÃO (Inline para menos overhead) ---
-            if check_compressed:
-                pub_c = pk.public_key.format(compressed=True)
-                sha_digest = sha256(pub_c).digest()
-                rip = new_ripemd()
-                rip.update(sha_digest)
-                h160_c = rip.digest()
-                
-                if h160_c in local_targets:
-                    found_event.set()
-                    save_discovery_v2(current, h160_c, "Compressed", found_list, lock)
-                    if stop_on_find: 
-                        gc.enable()
-                        return
-
-            if check_uncompressed:
-                pub_u = pk.public_key.format(compressed=False)
-                sha_digest = sha256(pub_u).digest()
-                rip = new_ripemd()
-                rip.update(sha_digest)
-                h160_u = rip.digest()
-                
-                if h160_u in local_targets:
-                    found_event.set()
-                    save_discovery_v2(current, h160_u, "Uncompressed", found_list, lock)
-                    if stop_on_find: 
-                        gc.enable()
-                        return
+            # --- PUBKEYS DIRETO NOS BUFFERS (chave inválida não ocupa slot) ---
+            if not add_key(current) and mode != "RANDOM" and current >= MAX_KEY_LIMIT:
+                break
             
             # --- MOVIMENTO MATEMÁTICO ---
             if mode == "LINEAR":
                 current += stride
             elif mode == "GEOMETRIC":
                 current *= multiplier
+
+        # --- COBERTURA (ordem-independente, por batch) ---
+        processed = buffers.n
+        if coverage is not None:
+            cov_count += processed
+            # Soma de hashes: conjuntos diferentes não colidem como soma/xor das chaves
+            scalars = memoryview(buffers.scalars)
+            for o in range(0, 32 * processed, 32):
+                cov_sum += int.from_bytes(hashlib.sha256(scalars[o:o + 32]).digest(), 'big')
+            cov_sum &= COVERAGE_MASK
+            del scalars
+
+        # --- HASH160 EM LOTE E VERIFICAÇÃO (lida direto dos buffers) ---
+        buffers.hash160()
+        for priv, h160, type_found in buffers.matches(local_targets):
+            if canary_set and h160 in canary_set:
+                # Alvo sintético do auto-teste: registra sem salvar/parar
+                canary_hits.append((h160, priv, time.time()))
+                continue
+            found_event.set()
+            save_discovery_v2(priv, h160, type_found, found_list, lock)
+            if stop_on_find: 
+                with counter.get_lock():
+                    counter.value += processed
+                if coverage is not None:
+                    coverage.append((core_id, cov_count, cov_sum))
+                if manage_gc:
+                    gc.enable()
+                return
         
         # --- UPDATE GLOBAL (A CADA BATCH) ---
-        batch_count += 1
-        if batch_count % (UPDATE_INTERVAL // BATCH_SIZE) == 0:
-            with counter.get_lock():
-                counter.value += (BATCH_SIZE * (UPDATE_INTERVAL // BATCH_SIZE))
-            
+        with counter.get_lock():
+            counter.value += processed
+        now = time.time()
+        if heartbeats is not None:
+            heartbeats[core_id] = now
+        if track_progress and current < MAX_KEY_LIMIT:
+            slot = progress[core_id]
+            pos = format(current, 'x').encode()
+            with slot.get_lock():  # o supervisor nunca lê uma posição pela metade
+                slot.value = pos
+
+        # --- AJUSTE DO BATCH ---
+        # Mira batch_target segundos por batch; cresce no máximo 2x por vez
+        # (um pico de velocidade não estoura a latência) e encolhe na hora.
+        elapsed = perf_counter() - t_batch
+        if batch_n == batch_size and elapsed > 0:
+            ideal = int(batch_n * batch_target / elapsed)
+            batch_size = max(BATCH_MIN, min(BATCH_MAX, batch_size * 2, ideal))
+
+        if core_id == 0 and now >= next_display:
             # Display atualizado
-            if core_id == 0:
-                try:
-                    hex_str = format(current, '064x')
-                    shared_key_display.value = hex_str.encode('utf-8')
-                except: 
-                    pass
-        else:
-            with counter.get_lock():
-                counter.value += BATCH_SIZE
+            next_display = now + DISPLAY_INTERVAL_S
+            try:
+                hex_str = format(current, '064x')
+                shared_key_display.value = hex_str.encode('utf-8')
+            except: 
+                pass
     
-    gc.enable()  # Re-abilitar GC ao sair
+    if coverage is not None:
+        coverage.append((core_id, cov_count, cov_sum))
+    if manage_gc:
+        gc.enable()  # Re-abilitar GC ao sair
+
+# --- EXECUÇÃO DETERMINÍSTICA (--seed) ---
+def derive_core_seed(seed, core_id, num_cores):
+    """Semente do PRNG de cada core: depende só de (seed, core_id, num_cores)."""
+    material = f"btc_gold:{seed}:{core_id}:{num_cores}".encode()
+    return int.from_bytes(hashlib.sha256(material).digest(), 'big')
+
+COVERAGE_MASK = 2**256 - 1
+
+def coverage_digest(entries):
+    """
+    Digest compacto do conjunto de chaves cobertas, a partir das entradas
+    (core_id, count, soma) dos workers, onde soma = Σ sha256(chave) mod 2^256.
+    Independe da ordem e da divisão entre cores: duas versões do engine que
+    cobriram o mesmo conjunto de chaves produzem o mesmo digest.
+    """
+    count, total = 0, 0
+    for _, c, s_ in entries:
+        count += c
+        total += s_
+    material = f"{count}:{total & COVERAGE_MASK:064x}".encode()
+    return count, hashlib.sha256(material).hexdigest()[:16]
 
 # --- SISTEMA DE SALVAMENTO ---
 def save_discovery_v2(private_int, h160_bytes, type_found, found_list, lock):
+    import base58
     priv_hex = format(private_int, '064x')
     with lock:
         if priv_hex in found_list: 
@@ -315,6 +406,18 @@ def save_checkpoint(val):
             json.dump({"last": val, "time": str(datetime.now())}, f)
     except: pass
 
+def linear_checkpoint(start_num, positions):
+    """
+    Ponto de retomada seguro para LINEAR: o core i está em p_i (próxima chave
+    não verificada, p_i ≡ start + i mod stride). Retomar em min(p_i - i) faz
+    cada core recomeçar em um ponto <= p_i da sua própria sequência: pode
+    repetir algumas chaves, nunca pula nenhuma. Sem posição de todos os
+    cores ainda, retorna o início.
+    """
+    if not positions or any(p is None for p in positions):
+        return start_num
+    return min(p - i for i, p in enumerate(positions))
+
 def load_checkpoint():
     if os.path.exists(CHECKPOINT_FILE):
         try:
@@ -325,47 +428,587 @@ def load_checkpoint():
 def get_bit_range_input():
     print(f"\n{Fore.YELLOW}[CONFIGURAÇÃO DE RANGE (Aleatório)]")
     print("Ex: '66' (bit 66) | '1:256' (Full) | '10:20' (Intervalo)")
-    val = input(f"{Fore.GREEN}>> Range: ").strip()
-    
-    start = 1
-    end = MAX_KEY_LIMIT
-    
-    if not val: return start, end
-        
-    if ":" in val:
-        try:
+    return prompt_valid(f"{Fore.GREEN}>> Range: ", parse_bit_range)
+
+def _bit(val):
+    try:
+        bit = int(val)
+    except ValueError:
+        raise ValueError(f"bit não numérico: {val.strip()!r}") from None
+    if not 1 <= bit <= 256:
+        raise ValueError(f"bit fora de 1..256: {bit}")
+    return bit
+
+def parse_bit_range(val):
+    """
+    '66' -> [2^65, 2^66) | '10:20' -> [2^9, 2^20) | '' -> range completo.
+    ValueError em formato inválido, bit fora de 1..256 ou intervalo invertido.
+    """
+    val = (val or "").strip()
+    if not val:
+        return 1, MAX_KEY_LIMIT
+
+    try:
+        if ":" in val:
             parts = val.split(":")
-            bit_min = int(parts[0])
-            bit_max = int(parts[1])
-            start = 2**(bit_min-1)
-            end = 2**bit_max
-        except: pass
+            if len(parts) != 2:
+                raise ValueError("use 'min:max'")
+            bit_min, bit_max = _bit(parts[0]), _bit(parts[1])
+        else:
+            bit_min = bit_max = _bit(val)
+    except ValueError as e:
+        raise ValueError(f"range de bits inválido: {val!r} ({e})") from None
+    if bit_min > bit_max:
+        raise ValueError(f"range de bits inválido: {val!r} (início maior que o fim)")
+    return 2**(bit_min-1), 2**bit_max
+
+# --- BACKEND DE EXECUÇÃO (PROCESSOS OU THREADS SEM GIL) ---
+BACKENDS = ("AUTO", "PROCESS", "THREAD")
+
+def gil_disabled():
+    """True apenas em Python free-threaded (3.13t+) com o GIL realmente desligado."""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled is not None and not is_enabled()
+
+def resolve_backend(requested="AUTO"):
+    """
+    AUTO   -> THREAD se o GIL está desligado, senão PROCESS
+    THREAD -> cai para PROCESS (com aviso) se o GIL estiver ativo
+    """
+    requested = (requested or "AUTO").upper()
+    if requested == "PROCESS":
+        return "PROCESS"
+    if gil_disabled():
+        return "THREAD"
+    if requested == "THREAD":
+        print(f"{Fore.YELLOW}[!] Backend THREAD pedido, mas o GIL está ativo: usando processos")
+    return "PROCESS"
+
+class ThreadCounter:
+    """Mesma interface de multiprocessing.Value('L') para o backend THREAD."""
+    def __init__(self, value=0):
+        self.value = value
+        self._lock = threading.Lock()
+
+    def get_lock(self):
+        return self._lock
+
+class DisplaySlot:
+    """Mesma interface de multiprocessing.Array('c') (atributo .value + get_lock)."""
+    def __init__(self, value=b""):
+        self.value = value
+        self._lock = threading.Lock()
+
+    def get_lock(self):
+        return self._lock
+
+class ThreadWorker:
+    """Handle de um worker em thread com a interface usada de Process."""
+    def __init__(self, future):
+        self.future = future
+
+    def is_alive(self):
+        return not self.future.done()
+
+    def join(self, timeout=None):
+        wait_futures([self.future], timeout=timeout)
+
+    def terminate(self):
+        pass  # Threads param de forma cooperativa via stop_event
+
+    @property
+    def exitcode(self):
+        """None = rodando, 0 = saiu normalmente, 1 = exceção (como Process)."""
+        if not self.future.done():
+            return None
+        return 1 if self.future.exception() is not None else 0
+
+class SharedState:
+    """
+    Estado compartilhado entre o main e os workers.
+    PROCESS: Manager/Event/Value (IPC). THREAD: objetos em memória do
+    próprio processo, uma única cópia de alvos, contador e resultados.
+    """
+    def __init__(self, backend="PROCESS"):
+        self.backend = backend
+        if backend == "THREAD":
+            self.manager = None
+            self.found_list = []
+            self.lock = threading.Lock()
+            self.found_event = threading.Event()
+            self.stop_event = threading.Event()
+            self.counter = ThreadCounter()
+            self.shared_key_display = DisplaySlot()
+        else:
+            self.manager = Manager()
+            self.found_list = self.manager.list()
+            self.lock = self.manager.Lock()
+            self.found_event = Event()
+            self.stop_event = Event()
+            self.counter = Value('L', 0)
+            self.shared_key_display = Array('c', 66)
+        self.shared_key_display.value = b"Starting..."
+
+    def new_event(self):
+        return threading.Event() if self.manager is None else Event()
+
+    def new_list(self):
+        return [] if self.manager is None else self.manager.list()
+
+    def new_heartbeats(self, n):
+        """Um timestamp por core (escrito sem lock: cada core só escreve o seu)."""
+        return [0.0] * n if self.manager is None else Array('d', n, lock=False)
+
+    def new_slots(self, n, size=66):
+        """
+        Um slot de texto por core (atributo .value), ex: posição em hex.
+        Com lock: .value é copiado byte a byte, então escrita e leitura
+        precisam de get_lock() para não ver um valor pela metade.
+        """
+        if self.manager is None:
+            return [DisplaySlot() for _ in range(n)]
+        return [Array('c', size) for _ in range(n)]
+
+# --- GC NO BACKEND THREAD ---
+# gc.disable() vale para o processo inteiro: com threads, o GC é desligado uma
+# vez antes de lançar os workers e só volta quando a última thread termina.
+_GC_LOCK = threading.Lock()
+_gc_holders = 0
+
+def _gc_hold(n):
+    global _gc_holders
+    with _GC_LOCK:
+        if _gc_holders == 0:
+            gc.disable()
+        _gc_holders += n
+
+def _gc_release():
+    global _gc_holders
+    with _GC_LOCK:
+        _gc_holders -= 1
+        if _gc_holders == 0:
+            gc.enable()
+
+def _thread_worker(core_id, args, kwargs):
+    try:
+        worker_engine(core_id, *args, **dict(kwargs or {}, manage_gc=False))
+    finally:
+        _gc_release()
+
+# --- LANÇAMENTO DOS WORKERS ---
+def start_workers(cores, args, kwargs=None, backend="PROCESS"):
+    """
+    Inicia um worker por core rodando worker_engine(core_id, *args, **kwargs):
+    um Process cada (PROCESS) ou um ThreadPoolExecutor no próprio processo (THREAD).
+    """
+    if backend == "THREAD":
+        _gc_hold(cores)  # antes do 1º submit: nenhuma thread religa o GC cedo
+        executor = ThreadPoolExecutor(max_workers=cores, thread_name_prefix="btc_gold")
+        workers = [ThreadWorker(executor.submit(_thread_worker, i, args, kwargs))
+                   for i in range(cores)]
+        executor.shutdown(wait=False)
+        return workers
+
+    return [start_worker(i, args, kwargs, backend) for i in range(cores)]
+
+def start_worker(core_id, args, kwargs=None, backend="PROCESS"):
+    """Inicia (ou reinicia, via supervisor) o worker de um único core."""
+    if backend == "THREAD":
+        _gc_hold(1)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="btc_gold")
+        worker = ThreadWorker(executor.submit(_thread_worker, core_id, args, kwargs))
+        executor.shutdown(wait=False)
+        return worker
+
+    p = Process(target=worker_engine, args=(core_id,) + tuple(args), kwargs=kwargs or {})
+    p.daemon = True
+    p.start()
+    return p
+
+# --- AUTO-TESTE: CANÁRIOS DE RESPOSTA CONHECIDA ---
+def plant_canaries(count, cores, scan_mode, mode, start_num, stride, multiplier, range_start, range_end, steps):
+    """
+    Sorteia `count` chaves privadas que o engine vai visitar nas primeiras
+    `steps` chaves de cada core, com a configuração atual:
+    - LINEAR/GEOMETRIC: posições aleatórias das sequências de cada core
+    - RANDOM: janela aleatória de cores*steps chaves dentro do range
+      (o auto-teste roda o RANDOM restrito a essa janela)
+    Retorna ({h160: (priv, tipo)}, range_start, range_end) para a execução.
+    """
+    from coincurve import PrivateKey
+    types = {1: ["Compressed"], 2: ["Uncompressed"], 3: ["Compressed", "Uncompressed"]}[scan_mode]
+
+    if mode == "RANDOM":
+        size = cores * steps
+        top = range_end or MAX_KEY_LIMIT
+        span = max(1, top - range_start - size)
+        range_start = range_start + secrets.randbelow(span)
+        range_end = min(range_start + size, top)
+
+    canaries = {}
+    attempts = 0
+    while len(canaries) < count and attempts < count * 100:
+        attempts += 1
+        core = secrets.randbelow(cores)
+        if mode == "LINEAR":
+            priv = start_num + core + secrets.randbelow(steps) * stride
+        elif mode == "GEOMETRIC":
+            priv = start_num + core
+            for _ in range(secrets.randbelow(steps)):
+                if priv * multiplier >= MAX_KEY_LIMIT: break
+                priv *= multiplier
+        else:
+            priv = range_start + secrets.randbelow(range_end - range_start)
+
+        if not (0 < priv < MAX_KEY_LIMIT):
+            continue
+        type_found = types[len(canaries) % len(types)]
+        pub = PrivateKey(priv.to_bytes(32, 'big')).public_key.format(compressed=(type_found == "Compressed"))
+        canaries[ripemd160(hashlib.sha256(pub).digest())] = (priv, type_found)
+
+    return canaries, range_start, range_end
+
+# Resposta conhecida, fixa no código (não passa pelo ripemd160 do engine):
+# chave 1 = puzzle #1, 1BgGZ9tcN4rm9KBzDn7KprQz87SZ26SAMH / 1EHNa6Q4Jz2uvNExL497mE43ikXhwF6kZm
+KNOWN_ANSWER = {
+    "Compressed": bytes.fromhex("751e76e8199196d454941c45d1b3a323f1433bd6"),
+    "Uncompressed": bytes.fromhex("91b24bf9f5288532960ac687abb035127b1d28a5"),
+}
+
+def check_known_answer(scan_mode):
+    """
+    Passa a chave 1 pelo caminho real do engine (BatchBuffers: pubkey,
+    SHA256, RIPEMD160 em lote, matches) contra HASH160 fixos. Os canários
+    são gerados com o mesmo ripemd160 do engine e não pegam um bug nele.
+    """
+    from batch_buffers import BatchBuffers
+    types = {1: ["Compressed"], 2: ["Uncompressed"], 3: ["Compressed", "Uncompressed"]}[scan_mode]
+    buffers = BatchBuffers(1, scan_mode in [1, 3], scan_mode in [2, 3])
+    buffers.reset(1)
+    buffers.add(1)
+    buffers.hash160()
+    found = {t for priv, h160, t in buffers.matches(set(KNOWN_ANSWER.values())) if priv == 1}
+    ok = found == set(types)
+    for t in types:
+        status = f"{Fore.GREEN}    [OK]   " if t in found else f"{Fore.RED}    [FALHA]"
+        print(f"{status} chave 1 ({t}) -> {KNOWN_ANSWER[t].hex()} [RIPEMD160: {RIPEMD160_BACKEND}]")
+    return ok
+
+def run_self_test(cores, target_set, scan_mode, mode, start_num, stride, multiplier, range_start, range_end, count=8, steps=20000, timeout=120, backend="PROCESS"):
+    """
+    Confere a resposta conhecida (check_known_answer), planta canários na
+    lookup real (alvos + canários), roda o worker_engine real em todos os
+    cores e confirma que cada canário foi encontrado.
+    Reporta tempo até encontrar cada um e throughput. Retorna True se todos
+    foram encontrados dentro do timeout.
+    """
+    print(f"\n{Fore.YELLOW}[*] AUTO-TESTE: resposta conhecida (chave 1, independente do hash do engine)")
+    if not check_known_answer(scan_mode):
+        print(f"{Fore.RED}[!] Auto-teste: o caminho de hash do engine não reproduz a resposta conhecida")
+        return False
+
+    canaries, t_start, t_end = plant_canaries(count, cores, scan_mode, mode, start_num, stride, multiplier, range_start, range_end, steps)
+    if not canaries:
+        print(f"{Fore.RED}[!] Auto-teste: nenhuma chave válida para plantar nessa configuração")
+        return False
+
+    print(f"\n{Fore.YELLOW}[*] AUTO-TESTE: {len(canaries)} canários em {len(target_set) + len(canaries)} alvos, modo {mode}, {cores} cores")
+
+    state = SharedState(backend)
+    canary_hits = state.new_list()
+    counter, stop_event = state.counter, state.stop_event
+    live_targets = set(target_set) | set(canaries)
+
+    start_time = time.time()
+    processes = start_workers(cores, (
+        cores, start_num, stride, mode, multiplier, live_targets, counter,
+        state.found_event, stop_event, False, state.found_list, state.lock, state.shared_key_display, scan_mode, t_start, t_end
+    ), {"canary_set": frozenset(canaries), "canary_hits": canary_hits}, backend)
+
+    found = {}
+    try:
+        while time.time() - start_time < timeout:
+            time.sleep(0.2)
+            for h160, priv, t_hit in list(canary_hits):
+                found.setdefault(h160, t_hit - start_time)
+            if len(found) == len(canaries):
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for p in processes:
+            p.join(timeout=2)
+            if p.is_alive(): p.terminate()
+
+    elapsed = time.time() - start_time
+    for h160, (priv, type_found) in sorted(canaries.items(), key=lambda c: found.get(c[0], float('inf'))):
+        if h160 in found:
+            print(f"{Fore.GREEN}    [OK]    {format(priv, '064x')} ({type_found}) em {found[h160]:.2f}s")
+        else:
+            print(f"{Fore.RED}    [FALHA] {format(priv, '064x')} ({type_found}) não encontrado")
+
+    hps = counter.value / elapsed if elapsed > 0 else 0
+    ok = len(found) == len(canaries)
+    color = Fore.GREEN if ok else Fore.RED
+    print(f"{color}[*] AUTO-TESTE: {len(found)}/{len(canaries)} encontrados | {elapsed:.1f}s | Speed: {hps/1000:,.1f} k/s")
+    return ok
+
+# --- MODO PUZZLE (MULTI-ALVO POR FAIXA) ---
+def run_puzzle_mode(cores, scan_mode, stop_on_find, selection="", policy="SMALLEST", weights="", backend="PROCESS", quiet=False):
+    """
+    Cada puzzle aberto de PUZZLE_FILE recebe um grupo de cores em modo RANDOM
+    dentro da sua faixa [2^(N-1), 2^N), verificando apenas o seu próprio alvo.
+    Quando um grupo encontra a chave, o puzzle é marcado como resolvido e os
+    cores liberados são realocados pela política escolhida.
+    Os workers rodam sob o WorkerSupervisor: heartbeat por core e reinício
+    no mesmo grupo (mesmo alvo, mesmo Event) se um core morrer ou travar.
+    Retorna o exit code do job (1 = nenhum puzzle aberto, 2 = seleção/pesos/alocação inválidos).
+    """
+    import asyncio
+    import puzzle_scheduler as ps
+    from supervisor import WorkerSupervisor
+
+    try:
+        numbers = ps.parse_puzzle_selection(selection or "")
+        weights = ps.parse_weights(weights) if policy == "WEIGHTED" and weights else None
+    except ValueError as e:
+        print(f"{Fore.RED}[!] Seleção de puzzles ou pesos inválida: {e}")
+        return 2
+
+    puzzles = ps.load_puzzles(PUZZLE_FILE, numbers=numbers)
+    if not puzzles:
+        print(f"{Fore.RED}[!] Nenhum puzzle aberto na seleção. Verifique '{PUZZLE_FILE}'")
+        return 1
+
+    assigned = []  # core -> número do puzzle que ele varre
+    alloc = ps.allocate_cores(puzzles, cores, policy, weights)
+    for number, n_cores in alloc.items():
+        assigned += [number] * n_cores
+    pool = len(assigned)
+    if pool == 0:
+        print(f"{Fore.RED}[!] Alocação inválida: nenhum core para os puzzles selecionados (pesos todos 0?)")
+        return 2
+
+    state = SharedState(backend)
+    found_list, lock = state.found_list, state.lock
+    stop_event, counter = state.stop_event, state.counter
+
+    by_number = {p["number"]: p for p in puzzles}
+    open_puzzles = dict(by_number)
+    events = {n: state.new_event() for n in by_number}  # setado quando o grupo acha a chave
+    heartbeats = state.new_heartbeats(pool)
+
+    def spawn(core_id, resume_from):
+        # RANDOM não retoma posição: reinício (ou realocação) só escolhe o grupo
+        p = by_number[assigned[core_id]]
+        return start_worker(core_id, (
+            pool, p["start"], 1, "RANDOM", 1, {p["h160"]}, counter,
+            events[p["number"]], stop_event, True, found_list, lock, state.shared_key_display,
+            scan_mode, p["start"], p["end"]
+        ), {"heartbeats": heartbeats}, backend)
+
+    def show_allocation():
+        for number in sorted(open_puzzles):
+            if assigned.count(number):
+                print(f"{Fore.CYAN}    - {ps.describe(open_puzzles[number])}: {assigned.count(number)} core(s)")
+
+    print(f"\n{Fore.YELLOW}[*] PUZZLE MODE: {len(puzzles)} puzzle(s) aberto(s), política {policy}")
+    processes = [spawn(i, None) for i in range(pool)]
+    show_allocation()
+    print()
+
+    start_time = time.time()
+    solved_count = 0
+
+    retiring = {}  # número -> (puzzle, prazo): grupo achou a chave, aguardando hit/saída
+
+    def retire_solved():
+        """
+        done() do supervisor: retira puzzles resolvidos e realoca os cores livres.
+        Roda no event loop: nada de sleep/join, o prazo de cada grupo é
+        verificado de novo a cada tick.
+        """
+        nonlocal solved_count
+        for number in [n for n in open_puzzles if events[n].is_set()]:
+            retiring[number] = (open_puzzles.pop(number), time.time() + 2)
+
+        for number, (p, deadline) in list(retiring.items()):
+            # found_event é setado antes do append em found_list
+            with lock:
+                hits = [int(h, 16) for h in found_list]
+            priv = next((k for k in hits if p["start"] <= k < p["end"]), None)
+            freed = [i for i, n in enumerate(assigned) if n == number]
+            running = [i for i in freed if supervisor.workers[i].is_alive()]
+            if (priv is None or running) and time.time() < deadline:
+                continue
+
+            del retiring[number]
+            for i in running:
+                supervisor.workers[i].terminate()
+            if priv is not None:
+                ps.mark_solved(number, format(priv, '064x'))
+            solved_count += 1
+
+            print(f"\n{Fore.GREEN}[OK] Puzzle #{number} resolvido e retirado da fila.")
+            if stop_on_find:
+                return True
+
+            current = {n: assigned.count(n) for n in open_puzzles}
+            extra = ps.reallocate(list(open_puzzles.values()), current, len(freed), policy, weights)
+            free = iter(freed)
+            for n, n_cores in extra.items():
+                for _ in range(n_cores):
+                    i = next(free)
+                    assigned[i] = n
+                    supervisor.replace(i, spawn(i, None))
+            if extra:
+                print(f"{Fore.YELLOW}[*] Cores realocados:")
+                show_allocation()
+        return not retiring and not any(n in open_puzzles for n in assigned)
+
+    def status_line():
+        elapsed = time.time() - start_time
+        hps = counter.value / elapsed if elapsed > 0 else 0
+        return (
+            f"\r{Fore.BLUE}[PUZZLE] "
+            f"Speed: {Fore.GREEN}{hps/1000:,.1f} k/s "
+            f"{Fore.WHITE}| Abertos: {len(open_puzzles)} "
+            f"| Resolvidos: {solved_count} "
+            f"| Keys: {counter.value:,} "
+            f"| Cores: {supervisor.alive_count()}/{pool}"
+            + (f" | Restarts: {supervisor.restarts}" if supervisor.restarts else "")
+        )
+
+    supervisor = WorkerSupervisor(
+        spawn, processes, heartbeats,
+        status=None if quiet else status_line, done=retire_solved,
+        can_kill_stalled=(backend == "PROCESS"),
+    )
+
+    try:
+        asyncio.run(supervisor.run())
+
+    except KeyboardInterrupt:
+        print(f"\n\n{Fore.RED}[!] Parando...")
+
+    finally:
+        stop_event.set()
+        for p in supervisor.workers:
+            p.join(timeout=2)
+            if p.is_alive(): p.terminate()
+        print(f"{Fore.YELLOW}\n[*] Engine parado. Resultados salvos em '{FOUND_FILE}'")
+    if supervisor.failed is not None:
+        print(f"{Fore.RED}[!] Execução abortada: {supervisor.failed}")
+        return 1
+    return 0
+
+# --- CONFIGURAÇÃO DO JOB (INTERATIVO OU HEADLESS) ---
+DEFAULT_JOB = {
+    "targets": TARGET_FILE,
+    "input_type": "ADDRESS",   # ADDRESS | HASH160 | PUBKEY
+    "scan_mode": 1,            # 1 comprimidos | 2 descomprimidos | 3 ambos
+    "stop_on_find": False,
+    "mode": "LINEAR",          # LINEAR | RANDOM | GEOMETRIC | PUZZLE
+    "start_bit": None,         # LINEAR/GEOMETRIC (LINEAR sem bit = checkpoint)
+    "bits": "",                # RANDOM: '66' | '10:20' | '' (range completo)
+    "stride": None,            # LINEAR (padrão = cores)
+    "multiplier": 2,           # GEOMETRIC
+    "puzzles": "",             # PUZZLE: '71:80' | '66,67' | '' (todos abertos)
+    "policy": "SMALLEST",      # PUZZLE: SMALLEST | WEIGHTED
+    "weights": "",             # PUZZLE: '71:3,72:1'
+    "cores": None,             # padrão = todos os cores lógicos
+    "backend": "AUTO",
+    "seed": None,
+    "max_keys": None,
+    "self_test": False,
+    "quiet": False,
+}
+
+# Escolhas válidas: as mesmas do argparse, aplicadas também ao arquivo de job
+JOB_CHOICES = {
+    "mode": ("LINEAR", "RANDOM", "GEOMETRIC", "PUZZLE"),
+    "input_type": ("ADDRESS", "HASH160", "PUBKEY"),
+    "scan_mode": (1, 2, 3),
+    "policy": ("SMALLEST", "WEIGHTED"),
+    "backend": BACKENDS,
+}
+JOB_INTS = ("cores", "max_keys", "seed", "start_bit", "stride", "multiplier")
+JOB_STRS = ("targets", "bits", "puzzles", "weights")
+JOB_BOOLS = ("stop_on_find", "self_test", "quiet")
+
+def validate_job(job):
+    """
+    Normaliza (maiúsculas) e valida o job já mesclado (arquivo + linha de comando).
+    Retorna a lista de erros; vazia = job válido.
+    """
+    errors = []
+    for key, choices in JOB_CHOICES.items():
+        val = job[key]
+        if isinstance(val, str):
+            val = job[key] = val.strip().upper()
+        if isinstance(val, bool) or val not in choices:
+            errors.append(f"{key}={val!r} inválido (use {', '.join(str(c) for c in choices)})")
+    for key in JOB_INTS:
+        val = job[key]
+        if val is not None and (isinstance(val, bool) or not isinstance(val, int)):
+            errors.append(f"{key}={val!r} deve ser um inteiro")
+    for key, low in (("cores", 1), ("max_keys", 1), ("stride", 1), ("multiplier", 2)):
+        if isinstance(job[key], int) and not isinstance(job[key], bool) and job[key] < low:
+            errors.append(f"{key}={job[key]!r} deve ser >= {low}")
+    start_bit = job["start_bit"]
+    if isinstance(start_bit, int) and not isinstance(start_bit, bool) and not 1 <= start_bit <= 256:
+        errors.append(f"start_bit={start_bit!r} deve estar entre 1 e 256")
+    for key in JOB_STRS:
+        if not isinstance(job[key], str):
+            errors.append(f"{key}={job[key]!r} deve ser texto")
+    for key in JOB_BOOLS:
+        if not isinstance(job[key], bool):
+            errors.append(f"{key}={job[key]!r} deve ser true/false")
+    if isinstance(job["bits"], str):
+        try:
+            parse_bit_range(job["bits"])
+        except ValueError as e:
+            errors.append(f"bits: {e}")
+    if job["mode"] == "PUZZLE":
+        # Ignorados pelo modo PUZZLE: um job com max_keys nunca terminaria
+        for key in ("seed", "max_keys"):
+            if job[key] is not None:
+                errors.append(f"{key} não se aplica ao modo PUZZLE")
+        if job["self_test"] is True:
+            errors.append("self_test não se aplica ao modo PUZZLE")
+    return errors
+
+def load_job_file(path):
+    """Lê um job em JSON ou TOML (.toml, via tomllib do Python 3.11+)."""
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
     else:
+        with open(path, "r") as f:
+            data = json.load(f)
+    unknown = set(data) - set(DEFAULT_JOB)
+    if unknown:
+        raise ValueError(f"opções desconhecidas em {path}: {', '.join(sorted(unknown))}")
+    return data
+
+def prompt_valid(prompt, parse):
+    """Repete o prompt até `parse(resposta)` aceitar (ValueError = pergunta de novo)."""
+    while True:
+        val = input(prompt).strip()
         try:
-            bit = int(val)
-            start = 2**(bit-1)
-            end = 2**bit
-        except: pass
-    return start, end
+            parse(val)
+            return val
+        except ValueError as e:
+            print(f"{Fore.RED}[!] {e}")
 
-# --- MAIN ---
-def main():
-    os.system('cls' if os.name == 'nt' else 'clear')
-    if os.name == 'nt': os.system('title BTC GOLD PROFESSIONAL v2.4')
+def interactive_job(cores):
+    """Coleta o job pelos prompts do menu (modo clássico)."""
+    import puzzle_scheduler as ps
+
+    job = dict(DEFAULT_JOB)
 
-    print(f"{Fore.YELLOW}{Style.BRIGHT}")
-    print(r"""
-    ██████╗ ████████╗██╗██████╗ ███████╗
-    ██╔══██╗╚══██╔══╝██║██╔══██╗██╔════╝
-    ██████╔╝   ██║   ██║██║  ██║█████╗  
-    ██╔══██╗   ██║   ██║██║  ██║██╔══╝  
-    ██████╔╝   ██║   ██║██████╔╝███████╗
-    ╚═════╝    ╚═╝   ╚═╝╚═════╝ ╚══════╝
-    PROFESSIONAL EDITION v2.4 (AGGRESSIVE OPTIMIZATION)
-    """)
-    
-    cores = detect_system_specs()
-    
     # --- SELETOR DE INPUT DA DATABASE ---
     print(f"\n{Fore.YELLOW}[DATABASE INPUT FORMAT]")
     print(f"Qual o formato dos dados em '{os.path.basename(TARGET_FILE)}'?")
@@ -376,14 +1019,8 @@ def main():
     try: in_sel = input(f"{Fore.GREEN}>> Opção [1]: ").strip() or "1"
     except: in_sel = "1"
     
-    input_type = "ADDRESS"
-    if in_sel == "2": input_type = "HASH160"
-    elif in_sel == "3": input_type = "PUBKEY"
-
-    target_set, count = load_targets(TARGET_FILE, input_type)
-    if count == 0:
-        print(f"{Fore.RED}[!] Database vazia ou formato incorreto. Verifique '{TARGET_FILE}'")
-        sys.exit()
+    if in_sel == "2": job["input_type"] = "HASH160"
+    elif in_sel == "3": job["input_type"] = "PUBKEY"
 
     # 1. SCAN MODE
     print(f"\n{Fore.YELLOW}[ALVO - TIPO DE ENDEREÇO]")
@@ -392,143 +1029,348 @@ def main():
     print(f"[3] AMBOS")
     try: s_in = input(f"{Fore.GREEN}>> Opção [1]: ").strip() or "1"
     except: s_in = "1"
-    scan_mode = int(s_in) if s_in in ['1','2','3'] else 1
+    job["scan_mode"] = int(s_in) if s_in in ['1','2','3'] else 1
 
     # 2. STOP ON FIND
     print(f"\n{Fore.YELLOW}[PARADA AUTOMÁTICA]")
     print(f"[S] Parar ao encontrar primeiro resultado")
     print(f"[N] Continuar minerando infinitamente (Padrão)")
     stop_choice = input(f"{Fore.GREEN}>> Opção [N]: ").strip().upper()
-    stop_on_find = (stop_choice == 'S')
+    job["stop_on_find"] = (stop_choice == 'S')
 
     # 3. OPERATION MODE
     print(f"\n{Fore.YELLOW}[MODO DE OPERAÇÃO]")
     print(f"1. SEQUENCIAL {Fore.CYAN}(Range Attack)")
     print(f"2. RANDOM {Fore.CYAN}(Range Aleatório)")
     print(f"3. GEOMÉTRICO {Fore.CYAN}(Multiplicação)")
+    print(f"4. PUZZLE {Fore.CYAN}(Multi-alvo por faixa: {os.path.basename(PUZZLE_FILE)})")
     try: m_in = input(f"{Fore.GREEN}>> Selecione: ").strip()
     except: sys.exit()
 
-    start_num = 1
-    mode = "LINEAR"
-    stride = 1
-    multiplier = 1
-    range_start = 1
-    range_end = None
-
     if m_in == "1": # SEQUENCIAL
-        mode = "LINEAR"
+        job["mode"] = "LINEAR"
         print(f"\n{Fore.YELLOW}[CONFIG SEQUENCIAL]")
         print("Digite o BIT inicial (ex: 66) ou ENTER para Checkpoint")
         bit_in = input(f"{Fore.GREEN}>> Bit Inicial: ").strip()
-        
-        if bit_in:
-            start_num = 2**(int(bit_in)-1)
-        else:
-            start_num = load_checkpoint()
-            print(f"{Fore.CYAN}[INFO] Retomando de: {start_num}")
+        job["start_bit"] = int(bit_in) if bit_in else None
 
         print(f"\nPulo Padrão = {cores} (Para não repetir chaves entre cores)")
         try:
             stride_in = input(f"{Fore.GREEN}>> Stride/Pulo [Enter = {cores}]: ").strip()
-            stride = int(stride_in) if stride_in else cores
-        except: stride = cores
+            job["stride"] = int(stride_in) if stride_in else cores
+        except: job["stride"] = cores
         
         print(f"{Fore.CYAN}[INFO] Cores 0-{cores-1} irão gerar chaves sem colisão")
 
     elif m_in == "2": # RANDOM
-        mode = "RANDOM"
-        range_start, range_end = get_bit_range_input()
+        job["mode"] = "RANDOM"
+        job["bits"] = get_bit_range_input()
         
     elif m_in == "3": # GEOMETRICO
-        mode = "GEOMETRIC"
+        job["mode"] = "GEOMETRIC"
         print(f"\n{Fore.YELLOW}[CONFIG GEOMÉTRICA]")
         print("Digite BIT inicial (ex: 1) e o Fator Multiplicador")
         bit_in = input(f"{Fore.GREEN}>> Bit Inicial [1]: ").strip()
-        start_num = 2**(int(bit_in)-1) if bit_in else 1
+        job["start_bit"] = int(bit_in) if bit_in else 1
         
         try:
             mult_in = input(f"{Fore.GREEN}>> Fator Multiplicador [2]: ").strip()
-            multiplier = int(mult_in) if mult_in else 2
-        except: multiplier = 2
+            job["multiplier"] = int(mult_in) if mult_in else 2
+        except: job["multiplier"] = 2
         
+        multiplier = job["multiplier"]
         print(f"{Fore.CYAN}[INFO] Sequence: C0={{start, start*{multiplier}, start*{multiplier}^2, ...}}")
         print(f"{Fore.CYAN}       C1={{start+1, (start+1)*{multiplier}, (start+1)*{multiplier}^2, ...}}")
 
+    elif m_in == "4": # PUZZLE
+        job["mode"] = "PUZZLE"
+        print(f"\n{Fore.YELLOW}[CONFIG PUZZLE]")
+        print("Puzzles a atacar. Ex: '71:80' | '66,67' | ENTER = todos os abertos")
+        job["puzzles"] = prompt_valid(f"{Fore.GREEN}>> Puzzles: ", ps.parse_puzzle_selection)
+
+        print(f"\n[1] SMALLEST - Todos os cores no menor intervalo aberto (Padrão)")
+        print(f"[2] WEIGHTED - Divide os cores entre os puzzles por peso")
+        pol_in = input(f"{Fore.GREEN}>> Política [1]: ").strip()
+        job["policy"] = "WEIGHTED" if pol_in == "2" else "SMALLEST"
+
+        if job["policy"] == "WEIGHTED":
+            print("Pesos opcionais. Ex: '71:3,72:1' (padrão = 1 para todos)")
+            job["weights"] = prompt_valid(f"{Fore.GREEN}>> Pesos: ", ps.parse_weights)
+        return job
+
+    # --- AUTO-TESTE (OPCIONAL) ---
+    print(f"\n{Fore.YELLOW}[AUTO-TESTE]")
+    print(f"Plantar alvos sintéticos (canários) e confirmar que o engine os encontra?")
+    st_choice = input(f"{Fore.GREEN}>> Rodar auto-teste antes do scan [s/N]: ").strip().upper()
+    job["self_test"] = (st_choice == 'S')
+    return job
+
+# --- EXECUÇÃO DO JOB ---
+def run_job(job, interactive=False):
+    """Executa um job (dict no formato de DEFAULT_JOB). Retorna o exit code."""
+    errors = validate_job(job)
+    if errors:
+        for err in errors:
+            print(f"{Fore.RED}[!] Job inválido: {err}")
+        return 2
+    require_crypto_backend()
+    cores = job["cores"] or cpu_count()
+    backend = resolve_backend(job["backend"])
+    mode = job["mode"].upper()
+    scan_mode = int(job["scan_mode"])
+    stop_on_find = bool(job["stop_on_find"])
+    seed, max_keys = job["seed"], job["max_keys"]
+
+    if mode == "PUZZLE":
+        return run_puzzle_mode(cores, scan_mode, stop_on_find, job["puzzles"], job["policy"], job["weights"],
+                               backend, job["quiet"])
+
+    target_set, count = load_targets(job["targets"], job["input_type"].upper())
+    if count == 0:
+        print(f"{Fore.RED}[!] Database vazia ou formato incorreto. Verifique '{job['targets']}'")
+        return 1
+
+    start_num = 1
+    stride = 1
+    multiplier = 1
+    range_start = 1
+    range_end = None
+
+    if mode == "LINEAR":
+        if job["start_bit"] is not None:
+            start_num = 2**(job["start_bit"]-1)
+        else:
+            start_num = load_checkpoint()
+            print(f"{Fore.CYAN}[INFO] Retomando de: {start_num}")
+        stride = job["stride"] or cores
+    elif mode == "RANDOM":
+        range_start, range_end = parse_bit_range(job["bits"])
+    elif mode == "GEOMETRIC":
+        start_num = 2**((job["start_bit"] or 1)-1)
+        multiplier = job["multiplier"]
+    else:
+        print(f"{Fore.RED}[!] Modo desconhecido: {job['mode']}")
+        return 1
+
+    self_test_s = 0.0
+    if job["self_test"]:
+        t_test = time.time()
+        ok = run_self_test(cores, target_set, scan_mode, mode, start_num, stride, multiplier, range_start, range_end, backend=backend)
+        if not ok:
+            if not interactive:
+                return 1
+            cont = input(f"{Fore.RED}>> Auto-teste FALHOU. Continuar mesmo assim? [s/N]: ").strip().upper()
+            if cont != 'S':
+                return 1
+        self_test_s = time.time() - t_test
+
+    import asyncio
+    from supervisor import WorkerSupervisor
+    from target_table import SharedTargetTable
+
     # --- EXECUÇÃO ---
-    manager = Manager()
-    found_list = manager.list()
-    lock = manager.Lock()
-    found_event = Event()
-    stop_event = Event()
-    counter = Value('L', 0)
-    shared_key_display = Array('c', 66)
-    shared_key_display.value = b"Starting..."
-
-    print(f"\n{Fore.YELLOW}[*] INICIANDO ENGINE V2.4 PRO EM {cores} CORES...")
+    state = SharedState(backend)
+    coverage = state.new_list() if seed is not None else None
+    found_list, lock = state.found_list, state.lock
+    found_event, stop_event = state.found_event, state.stop_event
+    counter, shared_key_display = state.counter, state.shared_key_display
+
+    print(f"\n{Fore.YELLOW}[*] INICIANDO ENGINE V2.4 PRO EM {cores} CORES ({'threads, GIL desligado' if backend == 'THREAD' else 'processos'})...")
     print(f"{Fore.CYAN}[*] Otimizações ativas:")
-    print(f"    - Memory pooling")
-    print(f"    - Batch processing (10k keys/batch)")
+    print(f"    - Buffers do batch reutilizados (pubkey/SHA256/HASH160 in-place)")
+    print(f"    - Batch adaptativo (~{BATCH_TARGET_S * 1000:.0f} ms/batch)")
     print(f"    - GC desabilitado durante execução")
     if NUMBA_AVAILABLE:
         print(f"    - Numba JIT compilação ATIVA")
+    if seed is not None:
+        print(f"    - Execução determinística (seed={seed})")
+    if max_keys is not None:
+        print(f"    - Orçamento: {max_keys:,} chaves")
     print(f"\n")
     
-    processes = []
-    
-    for i in range(cores):
-        p = Process(target=worker_engine, args=(
-            i, cores, start_num, stride, mode, multiplier, target_set, counter, 
-            found_event, stop_event, stop_on_find, found_list, lock, shared_key_display, scan_mode, range_start, range_end
-        ))
-        p.daemon = True
-        p.start()
-        processes.append(p)
+    heartbeats = state.new_heartbeats(cores)
+    progress = state.new_slots(cores)
+    worker_args = (
+        cores, start_num, stride, mode, multiplier, target_set, counter, 
+        found_event, stop_event, stop_on_find, found_list, lock, shared_key_display, scan_mode, range_start, range_end
+    )
+    table = SharedTargetTable(target_set, cores)
+    worker_kwargs = {"seed": seed, "max_keys": max_keys, "coverage": coverage,
+                     "heartbeats": heartbeats, "progress": progress,
+                     "targets_table": table.reader()}
+    processes = start_workers(cores, worker_args, worker_kwargs, backend)
+
+    def spawn(core_id, resume_from):
+        return start_worker(core_id, worker_args, dict(worker_kwargs, resume_from=resume_from), backend)
 
     start_time = time.time()
-    last_update = start_time
+
+    def status_line():
+        elapsed = time.time() - start_time
+        total = counter.value
+        hps = total / elapsed if elapsed > 0 else 0
+        return (
+            f"\r{Fore.BLUE}[RUNNING] "
+            f"Speed: {Fore.GREEN}{hps/1000:,.1f} k/s "
+            f"{Fore.WHITE}| Found: {len(found_list)} "
+            f"| Keys: {total:,} "
+            f"| Cores: {supervisor.alive_count()}/{cores}"
+            + (f" | Restarts: {supervisor.restarts}" if supervisor.restarts else "")
+        )
+
+    def flush_checkpoint():
+        if mode == "LINEAR":
+            positions = [supervisor.last_position(i) for i in range(cores)]
+            save_checkpoint(linear_checkpoint(start_num, positions))
+
+    def on_hits(new_hits):
+        flush_checkpoint()
+        print(f"\n{Fore.GREEN}[+] {len(new_hits)} novo(s) resultado(s) salvos em '{FOUND_FILE}'")
+
+    def on_first_heartbeat(t_first):
+        # O auto-teste roda entre o import e o scan: reportado à parte
+        startup_ms = (t_first - STARTUP_T0 - self_test_s) * 1000
+        print(f"{Fore.CYAN}[*] Startup até a 1ª chave: {startup_ms:,.0f} ms"
+              + (f" (+ auto-teste: {self_test_s:.1f} s)" if self_test_s else ""))
+
+    targets_file = job["targets"]
+    try:
+        targets_mtime = os.path.getmtime(targets_file)
+    except OSError:
+        targets_mtime = None
+
+    def reload_targets(force):
+        # Roda no executor do supervisor: compilar a database não trava o status
+        nonlocal targets_mtime
+        try:
+            mtime = os.path.getmtime(targets_file)
+        except OSError:
+            mtime = None
+        if mtime is not None and (force or mtime != targets_mtime):
+            targets_mtime = mtime
+            print()
+            new_set, new_count = load_targets(targets_file, job["input_type"].upper())
+            if new_count == 0:
+                print(f"{Fore.RED}[RELOAD] Database vazia: mantendo a versão {table.version}")
+            else:
+                version = table.publish(new_set)
+                print(f"{Fore.CYAN}[RELOAD] Database v{version} publicada: {len(new_set)} alvos")
+        table.collect([i for i, w in enumerate(supervisor.workers) if w.is_alive()])
+
+    def finished():
+        if stop_on_find and found_event.is_set():
+            return True
+        return supervisor.all_finished()  # orçamento esgotado ou sequência GEOMETRIC no fim da curva
+
+    supervisor = WorkerSupervisor(
+        spawn, processes, heartbeats, progress,
+        status=None if job["quiet"] else status_line, checkpoint=flush_checkpoint, hits=found_list,
+        on_hits=on_hits, done=finished, on_first_heartbeat=on_first_heartbeat,
+        reload=reload_targets, can_kill_stalled=(backend == "PROCESS"),
+        # Core reiniciado recomeçaria a cota e o PRNG: estouraria o orçamento e o digest
+        max_restarts=0 if seed is not None or max_keys is not None else 5,
+    )
     
     try:
-        while True:
-            time.sleep(0.5)
-            if stop_on_find and found_event.is_set():
-                time.sleep(1)
-                break
-                
-            elapsed = time.time() - start_time
-            total = counter.value
-            
-            if elapsed > 0:
-                hps = total / elapsed
-                try: hex_view = shared_key_display.value.decode('utf-8')
-                except: hex_view = "SYNC"
-                
-                sys.stdout.write(
-                    f"\r{Fore.BLUE}[RUNNING] "
-                    f"Speed: {Fore.GREEN}{hps/1000:,.1f} k/s "
-                    f"{Fore.WHITE}| Found: {len(found_list)} "
-                    f"| Keys: {total:,}"
-                )
-                sys.stdout.flush()
-                
-                if mode == "LINEAR" and int(elapsed) % 30 == 0:
-                    iterations = total // 10000
-                    checkpoint_val = start_num + (iterations * stride)
-                    save_checkpoint(checkpoint_val)
+        asyncio.run(supervisor.run())
+        if stop_on_find and found_event.is_set():
+            time.sleep(1)
 
     except KeyboardInterrupt:
         print(f"\n\n{Fore.RED}[!] Parando...")
-        if mode == "LINEAR":
-            iterations = counter.value // 10000
-            checkpoint_val = start_num + (iterations * stride)
-            save_checkpoint(checkpoint_val)
             
     finally:
         stop_event.set()
-        for p in processes: p.terminate()
+        for p in supervisor.workers:
+            p.join(timeout=2)
+            if p.is_alive(): p.terminate()
+        table.close()
+        flush_checkpoint()
+        if coverage is not None and supervisor.failed is None:
+            n_keys, digest = coverage_digest(list(coverage))
+            print(f"\n{Fore.CYAN}[*] Cobertura (seed={seed}, cores={cores}): {n_keys:,} chaves | digest {digest}")
+            print(f"{Fore.CYAN}[*] Keys contabilizadas: {counter.value:,} em {time.time() - start_time:.2f}s")
         print(f"{Fore.YELLOW}\n[*] Engine parado. Resultados salvos em '{FOUND_FILE}'")
+    if supervisor.failed is not None:
+        print(f"{Fore.RED}[!] Execução abortada: {supervisor.failed}")
+        return 1
+    return 0
+
+# --- MAIN ---
+def main(argv=None):
+    args = parse_args(argv)
+    overrides = {k: v for k, v in vars(args).items() if k in DEFAULT_JOB and v is not None}
+
+    # --- HEADLESS: --config e/ou --mode, sem prompts nem clear ---
+    if args.config or args.mode:
+        job = dict(DEFAULT_JOB)
+        if args.config:
+            try:
+                job.update(load_job_file(args.config))
+            except (OSError, ValueError) as e:
+                print(f"[!] Erro no arquivo de job: {e}")
+                return 2
+        job.update(overrides)
+        return run_job(job)
+
+    init_colors()
+    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.name == 'nt': os.system('title BTC GOLD PROFESSIONAL v2.4')
+
+    print(f"{Fore.YELLOW}{Style.BRIGHT}")
+    print(r"""
+    ██████╗ ████████╗██╗██████╗ ███████╗
+    ██╔══██╗╚══██╔══╝██║██╔══██╗██╔════╝
+    ██████╔╝   ██║   ██║██║  ██║█████╗  
+    ██╔══██╗   ██║   ██║██║  ██║██╔══╝  
+    ██████╔╝   ██║   ██║██████╔╝███████╗
+    ╚═════╝    ╚═╝   ╚═╝╚═════╝ ╚══════╝
+    PROFESSIONAL EDITION v2.4 (AGGRESSIVE OPTIMIZATION)
+    """)
+    
+    cores = detect_system_specs()
+    job = interactive_job(cores)
+    job.update(overrides)
+    return run_job(job, interactive=True)
+
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="BTC GOLD Professional v2.4",
+        epilog="Sem --mode/--config: menu interativo. Com eles: execução headless (sem prompts).")
+    parser.add_argument("--config", default=None,
+                        help="Job em JSON ou TOML (chaves = nomes das opções, ex: scan_mode). Opções da linha de comando têm prioridade")
+    parser.add_argument("--mode", type=str.upper, choices=JOB_CHOICES["mode"], default=None,
+                        help="Modo de operação (ativa o modo headless)")
+    parser.add_argument("--targets", default=None, help=f"Arquivo de alvos (padrão: {os.path.basename(TARGET_FILE)})")
+    parser.add_argument("--input-type", type=str.upper, choices=JOB_CHOICES["input_type"], default=None,
+                        help="Formato do arquivo de alvos")
+    parser.add_argument("--scan-mode", type=int, choices=JOB_CHOICES["scan_mode"], default=None,
+                        help="1 = comprimidos | 2 = descomprimidos | 3 = ambos")
+    parser.add_argument("--stop-on-find", action="store_true", default=None,
+                        help="Parar ao encontrar o primeiro resultado")
+    parser.add_argument("--start-bit", type=int, default=None,
+                        help="LINEAR/GEOMETRIC: bit inicial (LINEAR sem bit = checkpoint)")
+    parser.add_argument("--bits", default=None, help="RANDOM: '66' | '10:20' | vazio = range completo")
+    parser.add_argument("--stride", type=int, default=None, help="LINEAR: pulo (padrão = cores)")
+    parser.add_argument("--multiplier", type=int, default=None, help="GEOMETRIC: fator multiplicador")
+    parser.add_argument("--puzzles", default=None, help="PUZZLE: '71:80' | '66,67' | vazio = todos os abertos")
+    parser.add_argument("--policy", type=str.upper, choices=JOB_CHOICES["policy"], default=None,
+                        help="PUZZLE: política de alocação de cores")
+    parser.add_argument("--weights", default=None, help="PUZZLE/WEIGHTED: '71:3,72:1'")
+    parser.add_argument("--cores", type=int, default=None, help="Número de workers (padrão = cores lógicos)")
+    parser.add_argument("--self-test", action="store_true", default=None,
+                        help="Rodar os canários antes do scan (headless: aborta com exit 1 se falhar)")
+    parser.add_argument("--quiet", action="store_true", default=None, help="Sem linha de status")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Execução determinística: chaves RANDOM derivadas de (seed, core, cores) + digest de cobertura")
+    parser.add_argument("--max-keys", type=int, default=None,
+                        help="Orçamento total de chaves (dividido entre os cores); o engine para ao esgotar")
+    parser.add_argument("--backend", type=str.upper, choices=JOB_CHOICES["backend"], default=None,
+                        help="PROCESS (multiprocessing) | THREAD (Python free-threaded, GIL desligado) | AUTO")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
     import multiprocessing
     multiprocessing.freeze_support()
-    main()
+    sys.exit(main())
@@ -3,6 +3,8 @@ import sys
 import hashlib
 import binascii
 
+from ripemd160 import ripemd160
+
 try:
     import base58
 except ImportError:
@@ -13,9 +15,7 @@ def pubkey_to_hash160(pubkey_hex):
     try:
         pub_bytes = bytes.fromhex(pubkey_hex)
         sha = hashlib.sha256(pub_bytes).digest()
-        rip = hashlib.new('ripemd160')
-        rip.update(sha)
-        return rip.hexdigest()
+        return ripemd160(sha).hex()
     except: return None
 
 def address_to_hash160(address):
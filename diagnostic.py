@@ -12,6 +12,8 @@ import hashlib
 import platform
 import os
 
+from ripemd160 import RIPEMD160_BACKEND, ripemd160, ripemd160_batch_into_builtin
+
 print("\n" + "="*70)
 print("BTC GOLD DIAGNOSTIC TOOL")
 print("="*70 + "\n")
@@ -37,7 +39,8 @@ try:
 except ValueError as e:
     print(f"[ERROR] RIPEMD160 DESABILITADO!")
     print(f"        Mensagem: {e}")
-    print(f"\n        SOLUCAO (Linux):")
+    print(f"\n        O engine usa automaticamente o RIPEMD160 embutido ({RIPEMD160_BACKEND}).")
+    print(f"        Para voltar ao OpenSSL (mais rapido), opcional (Linux):")
     print(f"        1. openssl version -d")
     print(f"        2. nano /etc/ssl/openssl.cnf")
     print(f"        3. Adicione ao final:")
@@ -72,7 +75,23 @@ if ripemd_ok:
     if ripemd_kps < 20:
         print(f"[WARNING] RIPEMD160 LENTO! (< 20 k/s)")
 else:
-    print(f"[CRITICAL] RIPEMD160 nao funciona - isso explica 50% da lentidao!")
+    print(f"[!] RIPEMD160 do OpenSSL nao funciona - usando fallback embutido")
+
+# Benchmark do fallback embutido (sempre disponivel)
+print("\n[TEST] Benchmark RIPEMD160 embutido (lote de 32 bytes)...")
+digests = bytearray(os.urandom(32 * 10000))
+out = bytearray(20 * 10000)
+for kernel, label, hint in (("PYTHON", "Python", ""), ("NUMPY", "numpy", "pip install numpy"),
+                            ("NUMBA", "Numba", "pip install numba")):
+    try:
+        ripemd160_batch_into_builtin(digests, 10, out, kernel)  # Import/compilacao JIT fora da medicao
+        start = time.time()
+        ripemd160_batch_into_builtin(digests, 10000, out, kernel)
+        elapsed = time.time() - start
+        print(f"[+] Embutido ({label}){' ' * (7 - len(label))}: {(10000 / elapsed) / 1000:.1f} k/s")
+    except ImportError:
+        print(f"[*] Embutido ({label}){' ' * (7 - len(label))}: INDISPONIVEL ({hint})")
+print(f"[*] Backend ativo no engine: {RIPEMD160_BACKEND}")
 
 # ============================================================================
 print("\n[TESTE 2] coincurve Binding (C vs Python)")
@@ -124,10 +143,15 @@ print("-" * 70)
 print(f"[*] Versao Python: {platform.python_version()}")
 print(f"[*] Implementacao: {platform.python_implementation()}")
 
-if platform.python_implementation() == "CPython":
+gil_check = getattr(sys, "_is_gil_enabled", None)
+if gil_check is not None and not gil_check():
+    print("[OK] CPython free-threaded: GIL DESLIGADO")
+    print("    btc_gold.py --backend AUTO usa threads (1 copia de alvos, sem IPC)")
+elif platform.python_implementation() == "CPython":
     print("[!] CPython tem GIL (Global Interpreter Lock)")
     print("    Multiprocessing eh OBRIGATORIO para ganho real")
     print("    V2.4 usa multiprocessing (certo)")
+    print("    Com Python 3.13t (free-threaded) o backend THREAD fica disponivel")
 elif platform.python_implementation() == "PyPy":
     print("[OK] PyPy tem JIT compiler (mais rapido)")
 elif platform.python_implementation() == "Jython":
@@ -153,20 +177,15 @@ if sha256_kps < 100:
 print("\n[TESTE 5] Combined Hash160 (SHA256 + RIPEMD160)")
 print("-" * 70)
 
-if ripemd_ok:
-    print("[TEST] Benchmark combined hash160...")
-    start = time.time()
-    for i in range(10000):
-        data = os.urandom(33)  # Compressed public key
-        sha = hashlib.sha256(data).digest()
-        rip = hashlib.new('ripemd160')
-        rip.update(sha)
-        h160 = rip.digest()
-    elapsed = time.time() - start
-    combined_kps = (10000 / elapsed) / 1000
-    print(f"[+] SHA256+RIPEMD160: {combined_kps:.1f} k/s (esperado: 50+ k/s)")
-else:
-    print("[SKIP] RIPEMD160 nao funciona")
+print(f"[TEST] Benchmark combined hash160 ({RIPEMD160_BACKEND})...")
+start = time.time()
+for i in range(10000):
+    data = os.urandom(33)  # Compressed public key
+    sha = hashlib.sha256(data).digest()
+    h160 = ripemd160(sha)
+elapsed = time.time() - start
+combined_kps = (10000 / elapsed) / 1000
+print(f"[+] SHA256+RIPEMD160: {combined_kps:.1f} k/s (esperado: 50+ k/s)")
 
 # ============================================================================
 print("\n[TESTE 6] Full Benchmark (Realista)")
@@ -178,9 +197,7 @@ for i in range(5000):
     pk = PrivateKey(os.urandom(32))
     pub_c = pk.public_key.format(compressed=True)
     sha = hashlib.sha256(pub_c).digest()
-    rip = hashlib.new('ripemd160')
-    rip.update(sha)
-    h160 = rip.digest()
+    h160 = ripemd160(sha)
 elapsed = time.time() - start
 full_kps = (5000 / elapsed) / 1000
 print(f"[+] Full (KeyGen+Hash160): {full_kps:.1f} k/s")
@@ -188,6 +205,22 @@ print(f"    Esperado: 100+ k/s")
 print(f"    Seu benchmark: 24.2 k/s")
 print(f"    Diferenca: {24.2 / full_kps:.1f}x (BEM ERRADO!)")
 
+print("\n[TEST] Full com buffers do batch (pipeline do engine)...")
+try:
+    from batch_buffers import BatchBuffers
+    buffers = BatchBuffers(5000)
+    keys = [int.from_bytes(os.urandom(32), 'big') for _ in range(5000)]
+    start = time.time()
+    buffers.reset(5000)
+    for k in keys:
+        buffers.add(k)
+    buffers.hash160()
+    elapsed = time.time() - start
+    buffers_kps = (5000 / elapsed) / 1000
+    print(f"[+] Full (buffers, {buffers.backend}): {buffers_kps:.1f} k/s ({buffers_kps / full_kps:.1f}x)")
+except ImportError as e:
+    print(f"[!] Buffers do batch indisponiveis: {e}")
+
 # ============================================================================
 print("\n[ANALISE] Diagnostico Final")
 print("=" * 70)
@@ -195,7 +228,7 @@ print("=" * 70)
 problems = []
 
 if not ripemd_ok:
-    problems.append("CRITICO: RIPEMD160 desabilitado no OpenSSL 3.0+")
+    problems.append(f"ALERTA: RIPEMD160 desabilitado no OpenSSL 3.0+ (engine usa {RIPEMD160_BACKEND})")
 if keygen_kps < 10:
     problems.append("CRITICO: coincurve usando fallback Python puro")
 if sha256_kps < 100:
@@ -215,7 +248,9 @@ print("[RECOMENDACOES]")
 print("=" * 70)
 print("""
 1. Se RIPEMD160 está desabilitado:
-   Linux: Editar /etc/ssl/openssl.cnf e ativar legacy provider
+   Nada obrigatorio: o engine troca para o RIPEMD160 embutido no import.
+   Para velocidade maxima do fallback: pip install numba
+   Opcional (Linux): ativar legacy provider em /etc/ssl/openssl.cnf
    
 2. Se coincurve está em fallback Python:
    pip install --force-reinstall --no-cache-dir coincurve
@@ -0,0 +1,247 @@
+"""
+BTC GOLD - Estrategias de Lookup de HASH160
+
+Todas partem da tabela compilada (target_table.compile_table: HASH160 de
+20 bytes, ordenados, contiguos) e oferecem a mesma interface:
+
+    h in lookup                 -> bool (1 HASH160)
+    lookup.batch(buf, n)        -> indices dos slots de `buf` (n HASH160
+                                   contiguos, layout de BatchBuffers.h160_*)
+                                   que estao no conjunto
+    lookup.nbytes()             -> memoria ocupada (estimativa)
+    len(lookup)
+
+    SET        set do Python (o que o engine usa hoje)
+    SORTED     lista ordenada + bisect (1 HASH160); busca binaria em lote
+               (numpy.searchsorted quando disponivel; bisect com limite
+               inferior carregado senao)
+    PREFILTER  bitmap pelos primeiros bits do HASH160 (~16 bits/alvo) +
+               tabela exata ordenada; so os candidatos vao para a busca
+    MMAP       tabela ordenada em arquivo, lida via mmap (nada em RAM alem
+               das paginas tocadas)
+
+numpy e opcional (vem com o numba); sem ele os caminhos em lote sao Python.
+"""
+
+import os
+import sys
+import mmap
+import struct
+from bisect import bisect_left
+from importlib.util import find_spec
+
+HAS_NUMPY = find_spec("numpy") is not None
+
+STRATEGIES = ("SET", "SORTED", "PREFILTER", "MMAP")
+
+
+def _slots(buf, n):
+    """bytes com os n HASH160 de `buf` (1 copia): slices viram chaves hashaveis."""
+    return bytes(memoryview(buf)[:20 * n])
+
+
+def _search(table, count, h):
+    """Busca binaria de `h` na tabela contigua ordenada (bytes ou mmap)."""
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if table[mid * 20:mid * 20 + 20] < h:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo < count and table[lo * 20:lo * 20 + 20] == h
+
+
+def _as_s20(buf, n):
+    import numpy as np
+    return np.frombuffer(buf, dtype='S20', count=n)
+
+
+def _searchsorted_hits(table_arr, queries):
+    """Indices de `queries` presentes em `table_arr` (ambos 'S20', tabela ordenada)."""
+    import numpy as np
+    if len(table_arr) == 0:
+        return []
+    pos = np.searchsorted(table_arr, queries)
+    pos[pos == len(table_arr)] = 0
+    return np.nonzero(table_arr[pos] == queries)[0].tolist()
+
+
+# --- SET ---
+class SetLookup:
+    name = "SET"
+
+    def __init__(self, table):
+        self.targets = {table[o:o + 20] for o in range(0, len(table), 20)}
+
+    def __contains__(self, h):
+        return h in self.targets
+
+    def __len__(self):
+        return len(self.targets)
+
+    def batch(self, buf, n):
+        raw, targets = _slots(buf, n), self.targets
+        return [o // 20 for o in range(0, 20 * n, 20) if raw[o:o + 20] in targets]
+
+    def nbytes(self):
+        if not self.targets:
+            return sys.getsizeof(self.targets)
+        return sys.getsizeof(self.targets) + len(self.targets) * sys.getsizeof(next(iter(self.targets)))
+
+    def close(self):
+        pass
+
+
+# --- ARRAY ORDENADO ---
+class SortedLookup:
+    name = "SORTED"
+
+    def __init__(self, table):
+        # Lookup unitario: bisect na lista ordenada, com ou sem numpy (mesma
+        # latencia medida nos dois casos); o array 'S20' so serve ao lote
+        self.count = len(table) // 20
+        self.table = [table[o:o + 20] for o in range(0, len(table), 20)]
+        self.arr = _as_s20(bytes(table), self.count) if HAS_NUMPY else None
+
+    def __contains__(self, h):
+        i = bisect_left(self.table, h)
+        return i < self.count and self.table[i] == h
+
+    def __len__(self):
+        return self.count
+
+    def batch(self, buf, n):
+        if self.arr is not None:
+            return _searchsorted_hits(self.arr, _as_s20(buf, n))
+        # Consultas ordenadas: o limite inferior da busca so avanca
+        raw, table, count = _slots(buf, n), self.table, self.count
+        queries = sorted((raw[o:o + 20], o // 20) for o in range(0, 20 * n, 20))
+        hits, lo = [], 0
+        for h, j in queries:
+            lo = bisect_left(table, h, lo)
+            if lo < count and table[lo] == h:
+                hits.append(j)
+        hits.sort()
+        return hits
+
+    def nbytes(self):
+        size = sys.getsizeof(self.table) + self.count * sys.getsizeof(b'\x00' * 20)
+        return size + (self.arr.nbytes if self.arr is not None else 0)
+
+    def close(self):
+        pass
+
+
+# --- PREFILTRO + TABELA EXATA ---
+class PrefilterLookup:
+    name = "PREFILTER"
+
+    def __init__(self, table, bits_per_target=16):
+        self.table = bytes(table)
+        self.count = len(table) // 20
+        # Bitmap de 2^k bits indexado pelos k primeiros bits (HASH160 e uniforme)
+        k = max(10, min(32, (max(1, self.count) * bits_per_target - 1).bit_length()))
+        self.shift = 32 - k
+        self.bitmap = bytearray(1 << max(0, k - 3))
+        unpack_from, shift, bitmap = struct.unpack_from, self.shift, self.bitmap
+        for o in range(0, len(self.table), 20):
+            idx = unpack_from('>I', self.table, o)[0] >> shift
+            bitmap[idx >> 3] |= 1 << (idx & 7)
+        self.arr = _as_s20(self.table, self.count) if HAS_NUMPY else None
+
+    def __contains__(self, h):
+        idx = struct.unpack_from('>I', h)[0] >> self.shift
+        if not self.bitmap[idx >> 3] & (1 << (idx & 7)):
+            return False
+        return _search(self.table, self.count, h)
+
+    def __len__(self):
+        return self.count
+
+    def batch(self, buf, n):
+        if self.arr is not None:
+            import numpy as np
+            rows = np.frombuffer(buf, dtype=np.uint8, count=20 * n).reshape(n, 20)
+            prefix = rows[:, :4].copy().view('>u4').ravel() >> np.uint32(self.shift)
+            bits = np.frombuffer(self.bitmap, dtype=np.uint8)[prefix >> 3]
+            cand = np.nonzero(bits & (np.uint8(1) << (prefix & 7).astype(np.uint8)))[0]
+            if len(cand) == 0:
+                return []
+            queries = _as_s20(buf, n)[cand]
+            return cand[_searchsorted_hits(self.arr, queries)].tolist()
+
+        raw, unpack_from, shift, bitmap = _slots(buf, n), struct.unpack_from, self.shift, self.bitmap
+        table, count = self.table, self.count
+        hits = []
+        for o in range(0, 20 * n, 20):
+            idx = unpack_from('>I', raw, o)[0] >> shift
+            if bitmap[idx >> 3] & (1 << (idx & 7)) and _search(table, count, raw[o:o + 20]):
+                hits.append(o // 20)
+        return hits
+
+    def nbytes(self):
+        return len(self.bitmap) + len(self.table)
+
+    def close(self):
+        pass
+
+
+# --- TABELA EM ARQUIVO (MMAP) ---
+def write_table_file(table, path):
+    """Grava a tabela compilada (sorted HASH160, 20 bytes cada) em `path`."""
+    with open(path, "wb") as f:
+        f.write(table)
+
+
+class MmapLookup:
+    name = "MMAP"
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self.count = size // 20
+        self.table = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.arr = None
+        if HAS_NUMPY and size:
+            import numpy as np
+            self.arr = np.frombuffer(self.table, dtype='S20', count=self.count)
+
+    def __contains__(self, h):
+        return _search(self.table, self.count, h)
+
+    def __len__(self):
+        return self.count
+
+    def batch(self, buf, n):
+        if self.arr is not None:
+            return _searchsorted_hits(self.arr, _as_s20(buf, n))
+        raw, table, count = _slots(buf, n), self.table, self.count
+        return [o // 20 for o in range(0, 20 * n, 20) if _search(table, count, raw[o:o + 20])]
+
+    def nbytes(self):
+        return 0  # paginas do arquivo ficam no page cache, fora do heap
+
+    def close(self):
+        self.arr = None
+        if isinstance(self.table, mmap.mmap):
+            self.table.close()
+        self._file.close()
+
+
+def build_lookup(strategy, table, path=None):
+    """Monta a estrategia `strategy` a partir da tabela compilada. MMAP exige `path`."""
+    strategy = strategy.upper()
+    if strategy == "SET":
+        return SetLookup(table)
+    if strategy == "SORTED":
+        return SortedLookup(table)
+    if strategy == "PREFILTER":
+        return PrefilterLookup(table)
+    if strategy == "MMAP":
+        if path is None:
+            raise ValueError("MMAP precisa do caminho do arquivo da tabela")
+        write_table_file(table, path)
+        return MmapLookup(path)
+    raise ValueError(f"Estrategia desconhecida: {strategy} (use {', '.join(STRATEGIES)})")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+BTC GOLD Lookup Benchmark
+Mede como cada estrategia de lookup (lookup.py) escala com o tamanho da
+database: de 10^2 alvos (os 159 puzzles) ate 10^7 HASH160.
+
+Para cada estrategia e tamanho:
+    build_s            montar a estrutura a partir da tabela compilada
+    load_s             (MMAP) reabrir o arquivo ja gravado
+    memory_bytes       memoria da estrutura (estimativa; MMAP = page cache)
+    lookup_ns          latencia de 1 lookup (`h in lookup`), alvos ausentes
+    batch_keys_per_s   vazao de lookup.batch() em batches de --batch HASH160
+    hits_ok            o batch achou exatamente os alvos plantados
+
+Uso:
+    python lookup_bench.py                          # 10^2 .. 10^7, JSON no stdout
+    python lookup_bench.py --max-exp 5 --output lookup.json
+    python lookup_bench.py --strategies SET,PREFILTER --seed 1
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+from lookup import HAS_NUMPY, STRATEGIES, MmapLookup, build_lookup
+from target_table import compile_table
+
+
+def synthetic_table(size, rng):
+    """Tabela compilada com `size` HASH160 aleatorios distintos."""
+    targets = set()
+    while len(targets) < size:
+        targets.add(rng.getrandbits(160).to_bytes(20, 'big'))
+    return compile_table(targets)
+
+
+def query_batch(table, batch, hits, rng):
+    """Buffer de `batch` HASH160 (layout BatchBuffers) com `hits` alvos reais em posicoes aleatorias."""
+    buf = bytearray(rng.getrandbits(160 * batch).to_bytes(20 * batch, 'big'))
+    count = len(table) // 20
+    planted = sorted(rng.sample(range(batch), min(hits, batch, count)))
+    for j in planted:
+        t = rng.randrange(count)
+        buf[j * 20:j * 20 + 20] = table[t * 20:t * 20 + 20]
+    return buf, planted
+
+
+def bench_strategy(strategy, table, buf, planted, batch, lookups, tmp_dir):
+    path = os.path.join(tmp_dir, "targets.h160") if strategy == "MMAP" else None
+    result = {"strategy": strategy}
+
+    t0 = time.perf_counter()
+    lookup = build_lookup(strategy, table, path)
+    result["build_s"] = time.perf_counter() - t0
+    if strategy == "MMAP":
+        lookup.close()
+        t0 = time.perf_counter()
+        lookup = MmapLookup(path)
+        result["load_s"] = time.perf_counter() - t0
+    result["memory_bytes"] = lookup.nbytes()
+
+    try:
+        # Latencia: consultas ausentes (o caso comum no scan)
+        hit_set = {bytes(buf[j * 20:j * 20 + 20]) for j in planted}
+        misses = [bytes(buf[o:o + 20]) for o in range(0, 20 * batch, 20)]
+        misses = [h for h in misses if h not in hit_set] or misses
+        probe = (misses * (lookups // len(misses) + 1))[:lookups]
+        t0 = time.perf_counter()
+        for h in probe:
+            h in lookup
+        result["lookup_ns"] = (time.perf_counter() - t0) / lookups * 1e9
+
+        # Vazao em lote: repete ate ~0.2 s para estabilizar
+        rounds, elapsed, found = 0, 0.0, None
+        while elapsed < 0.2 or rounds < 3:
+            t0 = time.perf_counter()
+            found = lookup.batch(buf, batch)
+            elapsed += time.perf_counter() - t0
+            rounds += 1
+        result["batch_keys_per_s"] = rounds * batch / elapsed
+        result["hits_ok"] = list(found) == planted
+    finally:
+        lookup.close()
+        if path and os.path.exists(path):
+            os.remove(path)
+    return result
+
+
+def run(sizes, strategies, batch, hits, lookups, seed):
+    rng = random.Random(seed)
+    results = []
+    if HAS_NUMPY:
+        import numpy  # custo do import fora do build_s da 1a estrategia
+    with tempfile.TemporaryDirectory(prefix="btc_gold_lookup_") as tmp_dir:
+        for size in sizes:
+            t0 = time.perf_counter()
+            table = synthetic_table(size, rng)
+            gen_s = time.perf_counter() - t0
+            buf, planted = query_batch(table, batch, hits, rng)
+            for strategy in strategies:
+                entry = {"size": size, "generate_s": gen_s}
+                entry.update(bench_strategy(strategy, table, buf, planted, batch, lookups, tmp_dir))
+                results.append(entry)
+                print(f"[*] {strategy:<9} n={size:<10,} build {entry['build_s']:.3f}s | "
+                      f"{entry['lookup_ns']:,.0f} ns/lookup | {entry['batch_keys_per_s'] / 1e6:.2f} M/s lote | "
+                      f"{entry['memory_bytes'] / 2**20:,.1f} MiB | hits {'OK' if entry['hits_ok'] else 'ERRO'}",
+                      file=sys.stderr)
+            del table
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das estrategias de lookup de HASH160")
+    parser.add_argument("--min-exp", type=int, default=2, help="menor tamanho: 10^N alvos (padrao 2)")
+    parser.add_argument("--max-exp", type=int, default=7, help="maior tamanho: 10^N alvos (padrao 7)")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="lista separada por virgula")
+    parser.add_argument("--batch", type=int, default=4096, help="HASH160 por batch (padrao 4096)")
+    parser.add_argument("--hits", type=int, default=8, help="alvos reais plantados por batch")
+    parser.add_argument("--lookups", type=int, default=100000, help="lookups unitarios medidos")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="grava o JSON neste arquivo (padrao: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    strategies = [s.strip().upper() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        print(f"[!] Estrategia desconhecida: {', '.join(unknown)} (use {', '.join(STRATEGIES)})", file=sys.stderr)
+        return 2
+
+    sizes = [10**e for e in range(args.min_exp, args.max_exp + 1)]
+    results = run(sizes, strategies, args.batch, args.hits, args.lookups, args.seed)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "numpy": HAS_NUMPY,
+        "batch": args.batch,
+        "hits_per_batch": args.hits,
+        "lookups": args.lookups,
+        "seed": args.seed,
+        "results": results,
+    }
+
+    out = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+        print(f"[OK] Resultados em {args.output}", file=sys.stderr)
+    else:
+        print(out)
+    return 0 if all(r["hits_ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
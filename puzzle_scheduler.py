@@ -0,0 +1,200 @@
+"""
+BTC GOLD - Puzzle Scheduler
+
+Le alvos_address_puzzle.txt (um endereco por linha, em ordem: linha N =
+puzzle #N) e mapeia cada puzzle aberto para o seu intervalo de bits:
+
+    puzzle #N  ->  chave em [2^(N-1), 2^N)
+
+Cada core verifica apenas o alvo do seu proprio puzzle (set de 1 elemento),
+em vez de comparar cada chave contra todos os 159 hashes.
+
+Puzzles resolvidos saem da fila automaticamente:
+- linhas comentadas com '#' contam como resolvidas (a numeracao e mantida)
+- chaves encontradas pelo engine sao gravadas em PUZZLE_STATE_FILE
+"""
+
+import os
+import json
+
+FILE_DIR = os.path.dirname(os.path.abspath(__file__))
+PUZZLE_FILE = os.path.join(FILE_DIR, "alvos_address_puzzle.txt")
+PUZZLE_STATE_FILE = os.path.join(FILE_DIR, "puzzles_solved.json")
+
+POLICIES = ("SMALLEST", "WEIGHTED")
+
+
+# --- ESTADO (PUZZLES RESOLVIDOS) ---
+def load_solved(state_file=PUZZLE_STATE_FILE):
+    """Retorna {numero: priv_hex} dos puzzles ja resolvidos pelo engine."""
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, "r") as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    except:
+        return {}
+
+
+def mark_solved(number, priv_hex, state_file=PUZZLE_STATE_FILE):
+    solved = load_solved(state_file)
+    solved[number] = priv_hex
+    try:
+        with open(state_file, "w") as f:
+            json.dump({str(k): v for k, v in sorted(solved.items())}, f, indent=2)
+    except: pass
+
+
+# --- LOADER ---
+def load_puzzles(file_path=PUZZLE_FILE, state_file=PUZZLE_STATE_FILE, numbers=None):
+    """
+    Retorna a lista de puzzles abertos, ordenada pelo numero.
+    Cada puzzle: {"number", "address", "h160", "start", "end"} com end exclusivo.
+    `numbers` (opcional) restringe a selecao, ex: range(71, 81).
+    """
+    import base58
+
+    puzzles = []
+    if not os.path.exists(file_path):
+        return puzzles
+
+    solved = load_solved(state_file)
+    wanted = set(numbers) if numbers is not None else None
+
+    with open(file_path, "r") as f:
+        lines = [l.strip() for l in f if l.strip()]
+
+    for number, line in enumerate(lines, 1):
+        if line.startswith("#") or number in solved:
+            continue
+        if wanted is not None and number not in wanted:
+            continue
+        try:
+            h160 = base58.b58decode_check(line)[1:]
+        except:
+            continue
+        if len(h160) != 20:
+            continue
+        puzzles.append({
+            "number": number,
+            "address": line,
+            "h160": h160,
+            "start": 2**(number - 1),
+            "end": 2**number,
+        })
+    return puzzles
+
+
+def _puzzle_number(val):
+    try:
+        number = int(val)
+    except ValueError:
+        raise ValueError(f"numero de puzzle invalido: {val.strip()!r}")
+    if number < 1:
+        raise ValueError(f"numero de puzzle invalido: {number}")
+    return number
+
+
+def parse_puzzle_selection(val):
+    """
+    '71:80' -> range(71, 81) | '66' -> [66] | '66,67,70' -> [66, 67, 70] | '' -> None
+    Selecao mal formada (ex: '71-80') levanta ValueError.
+    """
+    val = val.strip()
+    if not val:
+        return None
+    if ":" in val:
+        lo, hi = val.split(":", 1)
+        lo, hi = _puzzle_number(lo), _puzzle_number(hi)
+        if lo > hi:
+            raise ValueError(f"intervalo vazio: {val!r}")
+        return range(lo, hi + 1)
+    return [_puzzle_number(v) for v in val.split(",") if v.strip()]
+
+
+def parse_weights(val):
+    """'71:3,72:1' -> {71: 3.0, 72: 1.0}. Entrada mal formada levanta ValueError."""
+    weights = {}
+    for part in val.split(","):
+        if not part.strip():
+            continue
+        if ":" not in part:
+            raise ValueError(f"peso sem ':': {part.strip()!r} (use numero:peso)")
+        num, w = part.split(":", 1)
+        try:
+            weight = float(w)
+        except ValueError:
+            raise ValueError(f"peso invalido: {part.strip()!r}")
+        if weight < 0:
+            raise ValueError(f"peso negativo: {part.strip()!r}")
+        weights[_puzzle_number(num)] = weight
+    return weights
+
+
+# --- ALOCAÇÃO DE CORES ---
+def allocate_cores(puzzles, cores, policy="SMALLEST", weights=None):
+    """
+    Retorna {numero_do_puzzle: quantidade_de_cores}.
+
+    SMALLEST: todos os cores no menor intervalo aberto; quando ele e
+              resolvido, a realocacao move os cores para o proximo.
+    WEIGHTED: cores divididos proporcionalmente ao peso de cada puzzle
+              (peso padrao = 1), arredondamento pelo maior resto.
+              Com menos cores que puzzles, os de maior peso (e menor
+              intervalo, no empate) ficam com os cores.
+    """
+    if not puzzles or cores <= 0:
+        return {}
+
+    if policy == "SMALLEST":
+        smallest = min(puzzles, key=lambda p: p["end"] - p["start"])
+        return {smallest["number"]: cores}
+
+    weights = weights or {}
+    ranked = sorted(puzzles, key=lambda p: (-weights.get(p["number"], 1.0), p["number"]))
+    ranked = [p for p in ranked if weights.get(p["number"], 1.0) > 0][:cores]
+    if not ranked:
+        return {}
+
+    total = sum(weights.get(p["number"], 1.0) for p in ranked)
+    shares = [(p["number"], cores * weights.get(p["number"], 1.0) / total) for p in ranked]
+
+    alloc = {num: max(1, int(share)) for num, share in shares}
+    remaining = cores - sum(alloc.values())
+    by_remainder = sorted(shares, key=lambda s: s[1] - int(s[1]), reverse=True)
+    i = 0
+    while remaining > 0:
+        alloc[by_remainder[i % len(by_remainder)][0]] += 1
+        remaining -= 1
+        i += 1
+    while remaining < 0:
+        # max(1, ...) pode exceder o total: retira dos maiores grupos
+        num = max(alloc, key=alloc.get)
+        alloc[num] -= 1
+        remaining += 1
+    return {num: n for num, n in alloc.items() if n > 0}
+
+
+def reallocate(puzzles, current, free_cores, policy="SMALLEST", weights=None):
+    """
+    Distribui `free_cores` liberados (puzzle resolvido) sem mexer nos grupos
+    que continuam rodando: cada core vai para o puzzle com maior deficit em
+    relacao a alocacao ideal para o total de cores.
+    Retorna {numero: cores_adicionais}.
+    """
+    total = sum(current.values()) + free_cores
+    target = allocate_cores(puzzles, total, policy, weights)
+    extra = {}
+    for _ in range(free_cores):
+        deficits = {num: target.get(num, 0) - current.get(num, 0) - extra.get(num, 0)
+                    for num in (p["number"] for p in puzzles)}
+        if not deficits:
+            break
+        num = max(deficits, key=lambda n: (deficits[n], -n))
+        extra[num] = extra.get(num, 0) + 1
+    return extra
+
+
+def describe(puzzle):
+    bits = puzzle["number"]
+    return f"#{bits} {puzzle['address']} [2^{bits-1}, 2^{bits})"
@@ -0,0 +1,363 @@
+"""
+BTC GOLD - RIPEMD-160 Embutido
+
+Fallback para hosts onde o OpenSSL 3 desabilita o provider 'legacy' e
+hashlib.new('ripemd160') falha (ou nao existe). Nenhuma edicao em
+/etc/ssl/openssl.cnf e necessaria.
+
+Especializado para o caso do engine: a entrada e sempre um digest SHA256
+de 32 bytes, o que cabe em um unico bloco de 64 bytes com padding fixo.
+O caminho em lote (ripemd160_batch_into) processa muitos digests de uma vez:
+com Numba o kernel e compilado (njit, nogil); so com numpy (dependencia
+do requirements.txt) cada passo roda no lote inteiro em colunas uint32.
+
+Uso:
+    from ripemd160 import RIPEMD160_BACKEND, ripemd160, ripemd160_batch_into
+
+ripemd160_batch_into(data, n, out) e usada in-place pelos buffers do batch
+do engine: le n digests contiguos de `data` e escreve em `out`.
+"""
+
+import struct
+import hashlib
+
+# --- CONSTANTES DO ALGORITMO ---
+_MASK = 0xFFFFFFFF
+_IV = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+# Ordem das palavras da mensagem (linha esquerda / direita)
+_RL = (
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13,
+)
+_RR = (
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11,
+)
+
+# Quantidade de rotacao por passo
+_SL = (
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6,
+)
+_SR = (
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11,
+)
+
+_KL = (0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E)
+_KR = (0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000)
+
+# Padding fixo para mensagens de 32 bytes: 0x80, zeros, tamanho = 256 bits
+_PAD_32 = (0x80, 0, 0, 0, 0, 0, 256, 0)
+
+# Rounds pre-combinados por grupo de 16 passos: (palavra, rotacao) x 2 linhas
+_GROUPS = tuple(
+    tuple((_RL[j], _SL[j], _RR[j], _SR[j]) for j in range(g * 16, g * 16 + 16))
+    for g in range(5)
+)
+
+
+# --- IMPLEMENTACAO PURA (PYTHON) ---
+def _compress(h0, h1, h2, h3, h4, x):
+    """
+    Aplica a funcao de compressao a um bloco de 16 palavras (little-endian).
+    Um laco por grupo de rounds: a funcao booleana fica inline, sem desvios
+    por passo. A linha direita usa as funcoes em ordem inversa.
+    """
+    M = _MASK
+    al, bl, cl, dl, el = h0, h1, h2, h3, h4
+    ar, br, cr, dr, er = h0, h1, h2, h3, h4
+
+    kl, kr = _KL[0], _KR[0]
+    for wl, sl, wr, sr in _GROUPS[0]:
+        t = (al + (bl ^ cl ^ dl) + x[wl] + kl) & M
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & M, bl, (((t << sl) | (t >> (32 - sl))) + el) & M
+        t = (ar + (br ^ (cr | (~dr & M))) + x[wr] + kr) & M
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & M, br, (((t << sr) | (t >> (32 - sr))) + er) & M
+
+    kl, kr = _KL[1], _KR[1]
+    for wl, sl, wr, sr in _GROUPS[1]:
+        t = (al + ((bl & cl) | (~bl & dl)) + x[wl] + kl) & M
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & M, bl, (((t << sl) | (t >> (32 - sl))) + el) & M
+        t = (ar + ((br & dr) | (cr & ~dr)) + x[wr] + kr) & M
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & M, br, (((t << sr) | (t >> (32 - sr))) + er) & M
+
+    kl, kr = _KL[2], _KR[2]
+    for wl, sl, wr, sr in _GROUPS[2]:
+        t = (al + ((bl | (~cl & M)) ^ dl) + x[wl] + kl) & M
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & M, bl, (((t << sl) | (t >> (32 - sl))) + el) & M
+        t = (ar + ((br | (~cr & M)) ^ dr) + x[wr] + kr) & M
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & M, br, (((t << sr) | (t >> (32 - sr))) + er) & M
+
+    kl, kr = _KL[3], _KR[3]
+    for wl, sl, wr, sr in _GROUPS[3]:
+        t = (al + ((bl & dl) | (cl & ~dl)) + x[wl] + kl) & M
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & M, bl, (((t << sl) | (t >> (32 - sl))) + el) & M
+        t = (ar + ((br & cr) | (~br & dr)) + x[wr] + kr) & M
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & M, br, (((t << sr) | (t >> (32 - sr))) + er) & M
+
+    kl, kr = _KL[4], _KR[4]
+    for wl, sl, wr, sr in _GROUPS[4]:
+        t = (al + (bl ^ (cl | (~dl & M))) + x[wl] + kl) & M
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & M, bl, (((t << sl) | (t >> (32 - sl))) + el) & M
+        t = (ar + (br ^ cr ^ dr) + x[wr] + kr) & M
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & M, br, (((t << sr) | (t >> (32 - sr))) + er) & M
+
+    return ((h1 + cl + dr) & M, (h2 + dl + er) & M, (h3 + el + ar) & M,
+            (h4 + al + br) & M, (h0 + bl + cr) & M)
+
+
+def ripemd160_32(data):
+    """RIPEMD-160 de exatamente 32 bytes (digest SHA256). Bloco unico."""
+    x = struct.unpack('<8I', data) + _PAD_32
+    return struct.pack('<5I', *_compress(*_IV, x))
+
+
+def ripemd160_pure(data):
+    """RIPEMD-160 de uma mensagem de tamanho arbitrario (Python puro)."""
+    if len(data) == 32:
+        return ripemd160_32(data)
+
+    msg = bytes(data) + b'\x80'
+    msg += b'\x00' * ((56 - len(msg)) % 64)
+    msg += struct.pack('<Q', (len(data) * 8) & 0xFFFFFFFFFFFFFFFF)
+
+    h = _IV
+    for off in range(0, len(msg), 64):
+        h = _compress(*h, struct.unpack_from('<16I', msg, off))
+    return struct.pack('<5I', *h)
+
+
+# --- KERNEL EM LOTE (NUMBA OPCIONAL) ---
+def _batch_kernel(data, out, n):
+    """
+    Calcula RIPEMD-160 de n digests de 32 bytes contiguos em `data`
+    e escreve os 20 bytes de cada resultado em `out` (layout plano).
+    Escrito sem objetos Python para poder ser compilado pelo Numba.
+    """
+    for i in range(n):
+        base = i * 32
+        x = [0] * 16
+        for w in range(8):
+            p = base + w * 4
+            x[w] = (int(data[p]) | (int(data[p + 1]) << 8) |
+                    (int(data[p + 2]) << 16) | (int(data[p + 3]) << 24))
+        x[8] = 0x80
+        x[14] = 256
+
+        al, bl, cl, dl, el = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0
+        ar, br, cr, dr, er = al, bl, cl, dl, el
+
+        for j in range(80):
+            r = j >> 4
+            if r == 0:
+                fl = bl ^ cl ^ dl
+                fr = br ^ (cr | (~dr & 0xFFFFFFFF))
+            elif r == 1:
+                fl = (bl & cl) | (~bl & dl)
+                fr = (br & dr) | (cr & ~dr)
+            elif r == 2:
+                fl = (bl | (~cl & 0xFFFFFFFF)) ^ dl
+                fr = (br | (~cr & 0xFFFFFFFF)) ^ dr
+            elif r == 3:
+                fl = (bl & dl) | (cl & ~dl)
+                fr = (br & cr) | (~br & dr)
+            else:
+                fl = bl ^ (cl | (~dl & 0xFFFFFFFF))
+                fr = br ^ cr ^ dr
+
+            sl = _SL[j]
+            t = (al + (fl & 0xFFFFFFFF) + x[_RL[j]] + _KL[r]) & 0xFFFFFFFF
+            t = (((t << sl) | (t >> (32 - sl))) + el) & 0xFFFFFFFF
+            al = el
+            el = dl
+            dl = ((cl << 10) | (cl >> 22)) & 0xFFFFFFFF
+            cl = bl
+            bl = t
+
+            sr = _SR[j]
+            t = (ar + (fr & 0xFFFFFFFF) + x[_RR[j]] + _KR[r]) & 0xFFFFFFFF
+            t = (((t << sr) | (t >> (32 - sr))) + er) & 0xFFFFFFFF
+            ar = er
+            er = dr
+            dr = ((cr << 10) | (cr >> 22)) & 0xFFFFFFFF
+            cr = br
+            br = t
+
+        h0 = (0xEFCDAB89 + cl + dr) & 0xFFFFFFFF
+        h1 = (0x98BADCFE + dl + er) & 0xFFFFFFFF
+        h2 = (0x10325476 + el + ar) & 0xFFFFFFFF
+        h3 = (0xC3D2E1F0 + al + br) & 0xFFFFFFFF
+        h4 = (0x67452301 + bl + cr) & 0xFFFFFFFF
+
+        o = i * 20
+        for k, h in enumerate((h0, h1, h2, h3, h4)):
+            out[o + k * 4] = h & 0xFF
+            out[o + k * 4 + 1] = (h >> 8) & 0xFF
+            out[o + k * 4 + 2] = (h >> 16) & 0xFF
+            out[o + k * 4 + 3] = (h >> 24) & 0xFF
+
+
+# --- KERNEL EM LOTE (NUMPY) ---
+# Sem Numba: o mesmo algoritmo, mas cada passo roda em todos os digests do
+# lote de uma vez (colunas uint32; soma e deslocamento ja truncam em 32 bits).
+_NUMPY_CHUNK = 8192  # digests por passada: as ~20 colunas de trabalho cabem no cache
+
+
+def _numpy_compress(x):
+    """Compressao de um bloco para colunas uint32; x[w] None = palavra zero."""
+    import numpy as np
+    h = [np.uint32(v) for v in _IV]
+    al, bl, cl, dl, el = (np.full(len(x[0]), v, dtype=np.uint32) for v in _IV)
+    ar, br, cr, dr, er = al.copy(), bl.copy(), cl.copy(), dl.copy(), el.copy()
+
+    for j in range(80):
+        r = j >> 4
+        if r == 0:
+            fl = bl ^ cl ^ dl
+            fr = br ^ (cr | ~dr)
+        elif r == 1:
+            fl = (bl & cl) | (~bl & dl)
+            fr = (br & dr) | (cr & ~dr)
+        elif r == 2:
+            fl = (bl | ~cl) ^ dl
+            fr = (br | ~cr) ^ dr
+        elif r == 3:
+            fl = (bl & dl) | (cl & ~dl)
+            fr = (br & cr) | (~br & dr)
+        else:
+            fl = bl ^ (cl | ~dl)
+            fr = br ^ cr ^ dr
+
+        fl += al
+        if _KL[r]:
+            fl += np.uint32(_KL[r])
+        if x[_RL[j]] is not None:
+            fl += x[_RL[j]]
+        sl = _SL[j]
+        t = (fl << np.uint32(sl)) | (fl >> np.uint32(32 - sl))
+        t += el
+        al, el, dl, cl, bl = el, dl, (cl << np.uint32(10)) | (cl >> np.uint32(22)), bl, t
+
+        fr += ar
+        if _KR[r]:
+            fr += np.uint32(_KR[r])
+        if x[_RR[j]] is not None:
+            fr += x[_RR[j]]
+        sr = _SR[j]
+        t = (fr << np.uint32(sr)) | (fr >> np.uint32(32 - sr))
+        t += er
+        ar, er, dr, cr, br = er, dr, (cr << np.uint32(10)) | (cr >> np.uint32(22)), br, t
+
+    return (h[1] + cl + dr, h[2] + dl + er, h[3] + el + ar,
+            h[4] + al + br, h[0] + bl + cr)
+
+
+def _numpy_batch_into(data, n, out):
+    """RIPEMD-160 de n digests de 32 bytes de `data`, em colunas numpy, escritos em `out`."""
+    import numpy as np
+    words = np.frombuffer(data, dtype='<u4', count=8 * n).reshape(n, 8)
+    res = np.frombuffer(out, dtype='<u4', count=5 * n).reshape(n, 5)
+    pad = [np.uint32(0x80)] + [None] * 5 + [np.uint32(256), None]
+    for lo in range(0, n, _NUMPY_CHUNK):
+        hi = min(n, lo + _NUMPY_CHUNK)
+        x = [np.ascontiguousarray(words[lo:hi, w]) for w in range(8)] + pad
+        for k, col in enumerate(_numpy_compress(x)):
+            res[lo:hi, k] = col
+
+
+_numba_kernel = None
+
+
+def _get_numba_kernel():
+    """Compila o kernel em lote sob demanda (evita custo de import do Numba)."""
+    global _numba_kernel
+    if _numba_kernel is None:
+        from numba import njit
+        _numba_kernel = njit(cache=True, nogil=True)(_batch_kernel)
+    return _numba_kernel
+
+
+def _builtin_kernel():
+    """NUMBA > NUMPY > PYTHON. find_spec: verifica sem pagar o import do Numba (segundos)."""
+    from importlib.util import find_spec
+    if find_spec("numpy") is None:
+        return "PYTHON"
+    return "NUMBA" if find_spec("numba") is not None else "NUMPY"
+
+
+def ripemd160_batch_into_builtin(data, n, out, kernel=None):
+    """
+    Versao in-place do lote embutido: `data` contem n digests de 32 bytes
+    contiguos e `out` (bytearray) recebe 20 bytes por digest. Numba e numpy
+    leem e escrevem direto nos buffers; o caminho Python usa unpack_from/pack_into.
+    """
+    if n == 0:
+        return
+
+    if kernel is None:
+        kernel = _KERNEL
+
+    if kernel == "NUMBA":
+        import numpy as np
+        _get_numba_kernel()(np.frombuffer(data, dtype=np.uint8),
+                            np.frombuffer(out, dtype=np.uint8), n)
+        return
+    if kernel == "NUMPY":
+        _numpy_batch_into(data, n, out)
+        return
+
+    unpack_from, pack_into = struct.unpack_from, struct.pack_into
+    for i in range(n):
+        x = unpack_from('<8I', data, i * 32) + _PAD_32
+        pack_into('<5I', out, i * 20, *_compress(*_IV, x))
+
+
+# --- DETECCAO DO BACKEND (NO IMPORT) ---
+def _openssl_ripemd_ok():
+    try:
+        h = hashlib.new('ripemd160')
+        h.update(b'')
+        return h.hexdigest() == "9c1185a5c5e9fc54612808977ee8f548b2258d31"
+    except (ValueError, TypeError):
+        return False
+
+
+RIPEMD160_NATIVE = _openssl_ripemd_ok()
+_KERNEL = None if RIPEMD160_NATIVE else _builtin_kernel()
+
+if RIPEMD160_NATIVE:
+    RIPEMD160_BACKEND = "OPENSSL"
+else:
+    RIPEMD160_BACKEND = {"NUMBA": "BUILTIN (Numba)", "NUMPY": "BUILTIN (numpy)",
+                         "PYTHON": "BUILTIN (Python)"}[_KERNEL]
+
+
+if RIPEMD160_NATIVE:
+    _new = hashlib.new
+
+    def ripemd160(data):
+        """RIPEMD-160 de `data` usando o melhor backend disponivel."""
+        return _new('ripemd160', data).digest()
+
+    def ripemd160_batch_into(data, n, out):
+        """RIPEMD-160 dos n digests de 32 bytes de `data`, escritos em `out`."""
+        mv = memoryview(data)
+        for i in range(n):
+            out[i * 20:i * 20 + 20] = _new('ripemd160', mv[i * 32:i * 32 + 32]).digest()
+else:
+    ripemd160 = ripemd160_pure
+    ripemd160_batch_into = ripemd160_batch_into_builtin
@@ -127,6 +127,12 @@ else
     exit 1
 fi
 
+if python3 -c "import numpy" 2>/dev/null; then
+    echo "[OK] numpy OK"
+else
+    echo "[WARNING] numpy falhou: sem RIPEMD160 no OpenSSL, o fallback embutido fica ~5x mais lento"
+fi
+
 echo ""
 echo "[*] Rodando benchmark inicial..."
 echo ""
@@ -0,0 +1,231 @@
+"""
+BTC GOLD - Supervisor Assíncrono
+
+Substitui o laço de polling do main() por um único event loop asyncio que:
+- multiplexa display de status, checkpoint, coleta de hits e métricas
+- acompanha o heartbeat de cada worker (timestamp gravado a cada batch)
+- reinicia workers mortos (exit code != 0) ou travados (heartbeat parado),
+  devolvendo o trecho não concluído via `spawn(core_id, resume_from)`, com
+  backoff exponencial por core; passou de `max_restarts` no mesmo core, a
+  execução é encerrada e `failed` descreve o motivo
+- chama `reload(force)` periodicamente em um executor (watcher da database)
+  e imediatamente com force=True ao receber SIGHUP
+
+Não conhece o engine: tudo chega por callbacks, para servir tanto ao
+backend de processos quanto ao de threads.
+"""
+
+import sys
+import time
+import signal
+import asyncio
+
+
+class WorkerSupervisor:
+    def __init__(self, spawn, workers, heartbeats, progress=None, *,
+                 status=None, checkpoint=None, hits=None, on_hits=None, done=None,
+                 on_first_heartbeat=None, reload=None,
+                 stall_timeout=120.0, status_interval=0.5, checkpoint_interval=30.0,
+                 health_interval=1.0, reload_interval=2.0, can_kill_stalled=True,
+                 max_restarts=5, restart_backoff=1.0, max_backoff=60.0, log=print):
+        """
+        spawn(core_id, resume_from) -> novo handle (Process ou ThreadWorker)
+        workers: lista de handles iniciais, indexada por core_id
+        heartbeats: sequência compartilhada de timestamps (float) por core
+        progress: sequência de slots com .value (posição em hex) e get_lock() por core
+        status() -> str | checkpoint() -> None | hits: lista compartilhada
+        on_hits(novos) -> None | done() -> bool (encerra o supervisor)
+        on_first_heartbeat(timestamp) -> None: 1º worker pronto para gerar chaves
+        reload(force) -> None: roda fora do event loop (pode compilar a database)
+        max_restarts: reinícios por core antes de desistir (0 = nenhum);
+        entre reinícios do mesmo core espera restart_backoff * 2^k (até max_backoff)
+        """
+        self.spawn = spawn
+        self.workers = list(workers)
+        self.heartbeats = heartbeats
+        self.progress = progress
+        self.status = status
+        self.checkpoint = checkpoint
+        self.hits = hits
+        self.on_hits = on_hits
+        self.done = done
+        self.on_first_heartbeat = on_first_heartbeat
+        self.reload = reload
+        self.stall_timeout = stall_timeout
+        self.status_interval = status_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.health_interval = health_interval
+        self.reload_interval = reload_interval
+        self.can_kill_stalled = can_kill_stalled
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.log = log
+
+        self.restarts = 0
+        self.failed = None  # motivo, se o supervisor desistiu de um core
+        self.started_at = [time.time()] * len(self.workers)
+        self._core_restarts = [0] * len(self.workers)
+        self._retry_at = [0.0] * len(self.workers)
+        self._seen_hits = 0
+        self._first_heartbeat = None
+        self._stalled_reported = set()
+        self._stop = None
+        self._reload_now = None
+
+    # --- ESTADO DOS WORKERS ---
+    def last_position(self, core_id):
+        """Última posição reportada pelo core (int) ou None."""
+        if self.progress is None:
+            return None
+        slot = self.progress[core_id]
+        try:
+            with slot.get_lock():  # o worker reescreve o hex: leitura só com o lock
+                raw = slot.value
+            return int(raw, 16) if raw else None
+        except (ValueError, TypeError):
+            return None
+
+    def last_heartbeat(self, core_id):
+        hb = self.heartbeats[core_id] if self.heartbeats is not None else 0.0
+        return max(hb, self.started_at[core_id])
+
+    def alive_count(self):
+        return sum(1 for w in self.workers if w.is_alive())
+
+    def all_finished(self):
+        """Todos os workers saíram normalmente (ex: orçamento de chaves esgotado)."""
+        return all((not w.is_alive()) and w.exitcode == 0 for w in self.workers)
+
+    def restart(self, core_id, reason):
+        old = self.workers[core_id]
+        if old.is_alive():
+            old.terminate()
+            old.join(timeout=2)
+        resume_from = self.last_position(core_id)
+        self.workers[core_id] = self.spawn(core_id, resume_from)
+        self.started_at[core_id] = time.time()
+        self.restarts += 1
+        where = f" a partir de {resume_from:x}" if resume_from is not None else ""
+        self.log(f"\n[SUPERVISOR] Core {core_id} reiniciado ({reason}){where}")
+
+    def replace(self, core_id, worker):
+        """Troca o worker de um core sem contar reinício (ex: realocação do modo PUZZLE): zera o backoff."""
+        self.workers[core_id] = worker
+        self.started_at[core_id] = time.time()
+        self._core_restarts[core_id] = 0
+        self._retry_at[core_id] = 0.0
+
+    def _recover(self, core_id, reason, now):
+        """Reinicia o core respeitando o backoff; além de max_restarts, encerra a execução."""
+        if now < self._retry_at[core_id]:
+            return
+        count = self._core_restarts[core_id]
+        if count >= self.max_restarts:
+            self.failed = f"core {core_id}: {reason}"
+            self.log(f"\n[SUPERVISOR] Core {core_id} falhou ({reason}) após {count} reinício(s): encerrando")
+            self._stop.set()
+            return
+        self.restart(core_id, reason)
+        self._core_restarts[core_id] = count + 1
+        self._retry_at[core_id] = now + min(self.max_backoff, self.restart_backoff * 2 ** count)
+
+    # --- TAREFAS DO EVENT LOOP ---
+    async def _first_heartbeat_loop(self):
+        while self._first_heartbeat is None and self.heartbeats is not None:
+            beats = [hb for hb in self.heartbeats if hb > 0]
+            if beats:
+                self._first_heartbeat = min(beats)
+                if self.on_first_heartbeat is not None:
+                    self.on_first_heartbeat(self._first_heartbeat)
+                break
+            await asyncio.sleep(0.005)
+
+    async def _health_loop(self):
+        while not self._stop.is_set():
+            now = time.time()
+            for core_id, w in enumerate(self.workers):
+                if not w.is_alive():
+                    if w.exitcode not in (0, None):
+                        self._recover(core_id, f"exit code {w.exitcode}", now)
+                        if self.failed:
+                            break
+                    continue
+                if now - self.last_heartbeat(core_id) > self.stall_timeout:
+                    if self.can_kill_stalled:
+                        self._recover(core_id, f"sem heartbeat há {now - self.last_heartbeat(core_id):.0f}s", now)
+                        if self.failed:
+                            break
+                    elif core_id not in self._stalled_reported:
+                        self._stalled_reported.add(core_id)
+                        self.log(f"\n[SUPERVISOR] Core {core_id} sem heartbeat (thread não pode ser reiniciada)")
+            await asyncio.sleep(self.health_interval)
+
+    async def _status_loop(self):
+        while not self._stop.is_set():
+            if self.status is not None:
+                sys.stdout.write(self.status())
+                sys.stdout.flush()
+            await asyncio.sleep(self.status_interval)
+
+    async def _checkpoint_loop(self):
+        while not self._stop.is_set():
+            await asyncio.sleep(self.checkpoint_interval)
+            if self.checkpoint is not None:
+                self.checkpoint()
+
+    async def _hits_loop(self):
+        while not self._stop.is_set():
+            if self.hits is not None:
+                n = len(self.hits)
+                if n > self._seen_hits:
+                    new = list(self.hits[self._seen_hits:n])
+                    self._seen_hits = n
+                    if self.on_hits is not None:
+                        self.on_hits(new)
+            await asyncio.sleep(self.status_interval)
+
+    async def _done_loop(self):
+        while not self._stop.is_set():
+            if self.done is not None and self.done():
+                self._stop.set()
+                break
+            await asyncio.sleep(self.status_interval)
+
+    async def _reload_loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._reload_now.wait(), timeout=self.reload_interval)
+            except asyncio.TimeoutError:
+                pass
+            force = self._reload_now.is_set()
+            self._reload_now.clear()
+            try:
+                await loop.run_in_executor(None, self.reload, force)
+            except Exception as e:
+                self.log(f"\n[SUPERVISOR] Falha ao recarregar alvos: {e}")
+
+    def request_reload(self):
+        """Recarga imediata (SIGHUP ou chamada externa)."""
+        if self._reload_now is not None:
+            self._reload_now.set()
+
+    async def run(self):
+        self._stop = asyncio.Event()
+        self._reload_now = asyncio.Event()
+        loops = [self._health_loop(), self._status_loop(), self._checkpoint_loop(),
+                 self._hits_loop(), self._done_loop(), self._first_heartbeat_loop()]
+        if self.reload is not None:
+            loops.append(self._reload_loop())
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.request_reload)
+            except (AttributeError, NotImplementedError, RuntimeError):
+                pass  # Windows: sem SIGHUP, só o watcher
+        tasks = [asyncio.create_task(coro) for coro in loops]
+        try:
+            await self._stop.wait()
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,167 @@
+"""
+BTC GOLD - Tabela de Alvos Compartilhada (hot reload)
+
+O processo principal compila a database (HASH160 de 20 bytes, ordenados e
+sem duplicatas) em um segmento multiprocessing.shared_memory e publica a
+versao em um bloco de controle, tambem em shared memory:
+
+    [0]   versao publicada (Q)
+    [8]   slot ativo (Q)                     -> double buffer: 0 / 1
+    [16]  slot 0: contagem (Q) + nome (40s)
+    [64]  slot 1: contagem (Q) + nome (40s)
+    [112] ack por core (Q): ultima versao carregada pelo worker
+
+Publicar = escrever o slot inativo e, por ultimo, (versao, slot ativo).
+Os workers leem a versao entre batches (1 unpack_from); se mudou, copiam a
+tabela nova para um set (um por processo: as threads do backend THREAD
+compartilham o mesmo), fecham o segmento e gravam o ack. O segmento
+de uma versao so e liberado (unlink) quando todos os workers vivos ja
+confirmaram uma versao mais nova.
+"""
+
+import struct
+import threading
+from multiprocessing import shared_memory
+
+_HEADER = struct.Struct('<QQ')
+_SLOT = struct.Struct('<Q40s')
+_SLOTS_OFF = _HEADER.size
+_ACKS_OFF = _SLOTS_OFF + 2 * _SLOT.size
+
+
+def compile_table(targets):
+    """Set de HASH160 -> bytes contiguos ordenados (20 bytes por alvo)."""
+    return b''.join(sorted(h for h in targets if len(h) == 20))
+
+
+def _read_slot(buf, slot):
+    count, name = _SLOT.unpack_from(buf, _SLOTS_OFF + slot * _SLOT.size)
+    return count, name.rstrip(b'\x00').decode()
+
+
+# --- LADO DO PUBLICADOR (PROCESSO PRINCIPAL) ---
+class SharedTargetTable:
+    def __init__(self, targets, cores):
+        self.cores = cores
+        self.version = 0
+        self._segments = {}  # versao -> SharedMemory ainda nao liberado
+        self._lock = threading.Lock()  # publish/collect rodam no executor do supervisor
+        self.control = shared_memory.SharedMemory(create=True, size=_ACKS_OFF + 8 * cores)
+        self.control.buf[:_ACKS_OFF + 8 * cores] = bytes(_ACKS_OFF + 8 * cores)
+        self.publish(targets)
+        for core_id in range(cores):
+            struct.pack_into('<Q', self.control.buf, _ACKS_OFF + 8 * core_id, self.version)
+
+    def publish(self, targets):
+        """Compila `targets` em um segmento novo e o torna a versao ativa. Retorna a versao."""
+        table = compile_table(targets)
+        count = len(table) // 20
+        with self._lock:
+            seg = shared_memory.SharedMemory(create=True, size=max(len(table), 1))
+            seg.buf[:len(table)] = table
+
+            version = self.version + 1
+            slot = version % 2
+            buf = self.control.buf
+            _SLOT.pack_into(buf, _SLOTS_OFF + slot * _SLOT.size, count, seg.name.encode())
+            _HEADER.pack_into(buf, 0, version, slot)  # versao + slot ativo: 1 escrita, por ultimo
+
+            self._segments[version] = seg
+            self.version = version
+            return version
+
+    def acked(self, core_id):
+        return struct.unpack_from('<Q', self.control.buf, _ACKS_OFF + 8 * core_id)[0]
+
+    def collect(self, cores_alive=None):
+        """
+        Libera os segmentos que nenhum worker referencia mais.
+        cores_alive: cores a considerar (workers mortos nao seguram versoes).
+        Retorna quantos segmentos foram liberados.
+        """
+        with self._lock:
+            ids = range(self.cores) if cores_alive is None else cores_alive
+            oldest = min((self.acked(i) for i in ids), default=self.version)
+            freed = 0
+            for version in [v for v in self._segments if v < oldest and v < self.version]:
+                seg = self._segments.pop(version)
+                seg.close()
+                seg.unlink()
+                freed += 1
+            return freed
+
+    def reader(self):
+        """Handle para os workers, ja sincronizado com a versao atual."""
+        return TargetTableReader(self.control.name, self.version)
+
+    def close(self):
+        with self._lock:
+            for seg in self._segments.values():
+                seg.close()
+                seg.unlink()
+            self._segments.clear()
+            self.control.close()
+            self.control.unlink()
+
+
+# --- LADO DO WORKER ---
+class TargetTableReader:
+    def __init__(self, control_name, version, shared=None):
+        self.control_name = control_name
+        self.version = version
+        self._control = None
+        self._shared = shared  # reader de onde veio o local(): guarda o set da versao
+        self._lock = threading.Lock()
+        self._cache = None  # (versao, set) montado 1x por processo
+
+    def __getstate__(self):
+        return {"control_name": self.control_name, "version": self.version}
+
+    def __setstate__(self, state):
+        self.__init__(state["control_name"], state["version"])
+
+    def local(self):
+        """Copia com estado proprio (threads do backend THREAD compartilham o kwargs)."""
+        return TargetTableReader(self.control_name, self.version, shared=self)
+
+    def _load(self, version, name, count):
+        """
+        Set da `version`, montado uma vez e compartilhado pelas threads do
+        processo (THREAD: 1 copia da tabela, nao uma por core). None se o
+        cache ja esta em uma versao mais nova: o worker relê no proximo batch.
+        """
+        with self._lock:
+            if self._cache is not None:
+                if self._cache[0] == version:
+                    return self._cache[1]
+                if self._cache[0] > version:
+                    return None
+            seg = shared_memory.SharedMemory(name=name)
+            try:
+                raw = bytes(seg.buf[:20 * count])
+            finally:
+                seg.close()
+            targets = {raw[o:o + 20] for o in range(0, 20 * count, 20)}
+            self._cache = (version, targets)
+            return targets
+
+    def poll(self, core_id):
+        """Set com a tabela nova se outra versao foi publicada; senao None."""
+        if self._control is None:
+            self._control = shared_memory.SharedMemory(name=self.control_name)
+        buf = self._control.buf
+        version, slot = _HEADER.unpack_from(buf, 0)
+        if version == self.version:
+            return None
+
+        count, name = _read_slot(buf, slot)
+        if _HEADER.unpack_from(buf, 0)[0] != version:
+            return None  # publicacao em andamento: tenta de novo no proximo batch
+
+        targets = (self._shared or self)._load(version, name, count)
+        if targets is None:
+            return None
+
+        self.version = version
+        struct.pack_into('<Q', buf, _ACKS_OFF + 8 * core_id, version)
+        return targets